@@ -1,8 +1,11 @@
 import json
 import boto3
+from functools import lru_cache
 
-# Initialize Lex runtime client
-client = boto3.client('lexv2-runtime', region_name='your_region_name')
+@lru_cache(maxsize=None)
+def get_lex_client():
+    """Lex runtime client, created on first use and reused by warm invocations"""
+    return boto3.client('lexv2-runtime', region_name='your_region_name')
 
 def lambda_handler(event, context):
     try:
@@ -26,7 +29,7 @@ def lambda_handler(event, context):
         user_message = body.get("message", "")
 
         # Call Lex bot
-        lex_response = client.recognize_text(
+        lex_response = get_lex_client().recognize_text(
             botId='YOUR_BOT_ID',         # Lex bot ID
             botAliasId='YOUR_BOT_ALIAS_ID',    # Lex bot alias ID (ensure correct value)
             localeId='en_US',           # Language
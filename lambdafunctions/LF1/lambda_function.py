@@ -1,17 +1,99 @@
 import json
 import logging
+import time
+import uuid
 import boto3
-from utils import *
+from functools import lru_cache
+from zoneinfo import ZoneInfoNotFoundError
+from utils import get_slot_value, elicit_slot, close, validate_dining_suggestions, \
+    normalize_dining_time, minutes_until_dining, city_timezone, city_standard_offset
 
 # Set logging level
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize SQS client
-sqs_client = boto3.client('sqs', region_name='your_region_name')
+# SQS client is only needed on the fulfilment turn, so create it on first use
+@lru_cache(maxsize=None)
+def get_sqs_client():
+    """SQS client, reused by warm invocations"""
+    return boto3.client('sqs', region_name='your_region_name')
+
+# SQS Queue URLs, one per urgency tier. SQStoSES polls the more urgent tiers more often.
+SQS_QUEUE_URLS = {
+    "urgent": "Your_SQS_URGENT_URL",
+    "soon": "Your_SQS_SOON_URL",
+    "later": "Your_SQS_URL"
+}
+# (tier, meals starting within this many minutes); anything further out goes to "later"
+URGENCY_TIERS = [("urgent", 120), ("soon", 360)]
+
+# Routing fallbacks are published as CloudWatch metrics (Embedded Metric Format)
+METRICS_NAMESPACE = "DiningConcierge"
+
+
+def urgency_tier(minutes_until):
+    """Queue tier for a meal starting in `minutes_until` minutes."""
+    for tier, within_minutes in URGENCY_TIERS:
+        if minutes_until <= within_minutes:
+            return tier
+    return "later"
+
+
+def record_routing_fallback(reason):
+    """Count a request that could not be routed by its dining time, so a broken router is visible."""
+    print(json.dumps({
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Reason"]],
+                "Metrics": [{"Name": "UrgencyRoutingFallback", "Unit": "Count"}]
+            }]
+        },
+        "Reason": reason,
+        "UrgencyRoutingFallback": 1
+    }))
+
+
+def route_request(dining_time, location):
+    """
+    (normalized dining time, minutes until it, tier). Routing must never block the enqueue, so a time
+    that does not normalize (e.g. AMAZON.Time's "EV") goes to "later".
+    """
+    normalized_time = normalize_dining_time(dining_time)
+    if normalized_time is None:
+        logger.warning(f"Dining time {dining_time!r} is not a clock time, routing it to later")
+        record_routing_fallback("unparsed_dining_time")
+        return None, None, "later"
+
+    try:
+        timezone = city_timezone(location)
+    except ZoneInfoNotFoundError as e:
+        # Otherwise every request would land in "later"; an hour off during DST beats no routing
+        logger.error(f"No time-zone database ({e}), routing {location} by its standard UTC offset. Bundle tzdata.")
+        record_routing_fallback("timezone_unavailable")
+        timezone = city_standard_offset(location)
+
+    try:
+        minutes_until = minutes_until_dining(normalized_time, timezone)
+    except Exception as e:
+        logger.error(f"Could not work out how soon {normalized_time} is in {location}: {e}")
+        record_routing_fallback("routing_error")
+        return normalized_time, None, "later"
+    return normalized_time, minutes_until, urgency_tier(minutes_until)
 
-# SQS Queue URL
-SQS_QUEUE_URL = "Your_SQS_URL"
+
+def new_trace_context():
+    """Request id and enqueue time (epoch ms) that follow the request through SQStoSES to SES."""
+    return {"request_id": str(uuid.uuid4()), "enqueued_at": int(time.time() * 1000)}
+
+
+def trace_message_attributes(trace):
+    """Encode the trace context as SQS message attributes."""
+    return {
+        "RequestId": {"DataType": "String", "StringValue": trace["request_id"]},
+        "EnqueuedAt": {"DataType": "Number", "StringValue": str(trace["enqueued_at"])}
+    }
 
 
 def handle_dining_suggestions(intent_request):
@@ -93,12 +175,28 @@ def handle_dining_suggestions(intent_request):
         "email": email
     }
 
+    trace = new_trace_context()
+    normalized_time, minutes_until, tier = route_request(dining_time, location)
+    message_attributes = trace_message_attributes(trace)
+    message_attributes["UrgencyTier"] = {"DataType": "String", "StringValue": tier}
+    if normalized_time is not None:
+        message_attributes["DiningTime"] = {"DataType": "String", "StringValue": normalized_time}
+    if minutes_until is not None:
+        message_attributes["MinutesUntilDining"] = {"DataType": "Number", "StringValue": str(minutes_until)}
+
     try:
-        sqs_response = sqs_client.send_message(
-            QueueUrl=SQS_QUEUE_URL,
-            MessageBody=json.dumps(sqs_message, ensure_ascii=False)
+        sqs_response = get_sqs_client().send_message(
+            QueueUrl=SQS_QUEUE_URLS[tier],
+            MessageBody=json.dumps(sqs_message, ensure_ascii=False),
+            MessageAttributes=message_attributes
         )
         logger.info(f" SQS message successfully sent, Message ID: {sqs_response['MessageId']}")
+        logger.info(json.dumps({
+            "type": "trace", "request_id": trace["request_id"], "event": "enqueued",
+            "message_id": sqs_response["MessageId"], "timestamp": trace["enqueued_at"],
+            "urgency_tier": tier, "minutes_until_dining": minutes_until,
+            "enqueue_ms": int(time.time() * 1000) - trace["enqueued_at"]
+        }))
 
         # **Return Fulfilled response**
         message = (
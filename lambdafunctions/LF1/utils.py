@@ -1,4 +1,20 @@
 import datetime
+from zoneinfo import ZoneInfo
+
+DINING_TIME_FORMATS = ['%H:%M', '%I:%M %p']
+
+# Local time zone of each supported city, used to work out how soon a requested meal is,
+# with its standard UTC offset (hours) for runtimes without a time-zone database
+CITY_TIMEZONES = {
+    'new york': ('America/New_York', -5),
+    'boston': ('America/New_York', -5),
+    'miami': ('America/New_York', -5),
+    'chicago': ('America/Chicago', -6),
+    'seattle': ('America/Los_Angeles', -8),
+    'san francisco': ('America/Los_Angeles', -8)
+}
+DEFAULT_TIMEZONE = ('America/New_York', -5)
+DINING_TIME_GRACE_MINUTES = 60  # A time this recently passed means "now", not tomorrow
 
 # --- Lex Response Helper Functions ---
 
@@ -88,21 +104,49 @@ def is_valid_cuisine(cuisine):
     return cuisine.lower() in valid_cuisines if isinstance(cuisine, str) else False
 
 
+def normalize_dining_time(dining_time):
+    """Return the dining time as 24-hour HH:MM, or None if it is in no supported format"""
+    for fmt in DINING_TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(dining_time, fmt).strftime('%H:%M')
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
 def is_valid_dining_time(dining_time):
     """Check if the dining time follows Amazon Lex's amazon.time format"""
     try:
-        formats = ['%H:%M', '%I:%M %p']
-        for fmt in formats:
-            try:
-                datetime.datetime.strptime(dining_time, fmt).time()
-                return True, None
-            except ValueError:
-                continue
+        if normalize_dining_time(dining_time):
+            return True, None
         return False, "The dining time format is invalid. Please use HH:MM (24-hour) or H:MM AM/PM format."
     except Exception as e:
         return False, f"An unexpected error occurred: {str(e)}"
 
 
+def city_timezone(location):
+    """The city's time zone; raises ZoneInfoNotFoundError when the runtime has no time-zone database"""
+    return ZoneInfo(CITY_TIMEZONES.get(str(location).lower(), DEFAULT_TIMEZONE)[0])
+
+
+def city_standard_offset(location):
+    """Fixed standard-time UTC offset for the city (ignores daylight saving time)"""
+    name, hours = CITY_TIMEZONES.get(str(location).lower(), DEFAULT_TIMEZONE)
+    return datetime.timezone(datetime.timedelta(hours=hours), name)
+
+
+def minutes_until_dining(dining_time, timezone, now=None):
+    """Minutes until the next occurrence of a normalized HH:MM dining time in the given time zone"""
+    now = (now or datetime.datetime.now(datetime.timezone.utc)).astimezone(timezone)
+    hour, minute = map(int, dining_time.split(':'))
+    minutes = (hour * 60 + minute) - (now.hour * 60 + now.minute)
+
+    # Wrap into [-grace, 24h - grace): within the grace window (even across midnight) means now,
+    # anything further in the past means tomorrow
+    minutes = (minutes + DINING_TIME_GRACE_MINUTES) % (24 * 60) - DINING_TIME_GRACE_MINUTES
+    return max(minutes, 0)
+
+
 def is_valid_number_of_people(number_of_people):
     """Check if the number of people is reasonable"""
     try:
@@ -1,9 +1,13 @@
 import json
 import boto3
-import requests
-from requests_aws4auth import AWS4Auth
+import gzip
+from functools import lru_cache
+from opensearch_client import CONNECT_TIMEOUT, get_client, build_recommendation_query
 import random
 import os
+import time
+from contextlib import contextmanager
+from decimal import Decimal
 
 # AWS Configurations
 REGION = "your-region"
@@ -13,64 +17,287 @@ INDEX_NAME = "restaurants"
 DYNAMODB_TABLE = "your-dynamodb-table"
 SES_SENDER_EMAIL = "your-email@example.com"
 
-# AWS Clients
-session = boto3.Session()
-credentials = session.get_credentials()
+# Urgency tiers LF1 routes requests to by how soon the meal is. Each invocation polls the tiers
+# in a weighted random order, so a backlog drains time-critical requests first without starving "later".
+SQS_QUEUE_URLS = {
+    "urgent": "https://sqs.your-region.amazonaws.com/your-account-id/YourUrgentQueueName",
+    "soon": "https://sqs.your-region.amazonaws.com/your-account-id/YourSoonQueueName",
+    "later": SQS_URL
+}
+TIER_WEIGHTS = {"urgent": 6, "soon": 3, "later": 1}
 
-if credentials is None:
-    raise ValueError(" AWS Credentials not found. Check IAM permissions.")
+# Degraded mode: past this latency (seconds) OpenSearch is abandoned for the DynamoDB GSIs.
+# It bounds the connect and each socket read separately (requests has no whole-call timeout),
+# so a server trickling bytes can still take a multiple of it; slow responses are logged.
+OPENSEARCH_LATENCY_THRESHOLD = 1.0
+CITY_CUISINE_INDEX = "CityCuisineIndex"
+CUISINE_INDEX = "CuisineIndex"
+FALLBACK_CANDIDATES = 5
 
-awsauth = AWS4Auth(credentials.access_key, credentials.secret_key, REGION, "es", session_token=credentials.token)
-sqs = boto3.client("sqs", region_name=REGION)
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
-ses = boto3.client("ses", region_name=REGION)
-table = dynamodb.Table(DYNAMODB_TABLE)
+
+class OpenSearchUnavailable(Exception):
+    """OpenSearch errored or timed out, as opposed to answering with no hits."""
+
+# Recommendation snapshot built by otherscripts/buildRecommendations.py
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PATH = "recommendations.json.gz"  # Optional copy bundled with the deployment package
+SNAPSHOT_BUCKET = "your-snapshot-bucket"
+SNAPSHOT_KEY = "recommendations/snapshot.json.gz"
+SNAPSHOT_TTL_SECONDS = 300    # Warm containers pick up a newly published snapshot after this long
+SNAPSHOT_RETRY_SECONDS = 30   # Back-off before retrying a failed load
+_snapshot_cache = {"recommendations": None, "expires_at": 0.0}
+
+# Request-to-email latency is published as CloudWatch metrics (Embedded Metric Format)
+METRICS_NAMESPACE = "DiningConcierge"
+
+# AWS Clients (created on first use and reused by warm invocations)
+def opensearch():
+    """Shared keep-alive OpenSearch client that fails fast, so the GSI fallback can take over."""
+    return get_client(OPENSEARCH_HOST, REGION, max_retries=0,
+                      timeout=(min(CONNECT_TIMEOUT, OPENSEARCH_LATENCY_THRESHOLD), OPENSEARCH_LATENCY_THRESHOLD))
+
+@lru_cache(maxsize=None)
+def get_sqs():
+    """SQS client for the request queue."""
+    return boto3.client("sqs", region_name=REGION)
+
+@lru_cache(maxsize=None)
+def get_ses():
+    """SES client for outgoing recommendation emails."""
+    return boto3.client("ses", region_name=REGION)
+
+@lru_cache(maxsize=None)
+def get_table():
+    """DynamoDB table with the full restaurant details."""
+    return boto3.resource("dynamodb", region_name=REGION).Table(DYNAMODB_TABLE)
+
+@lru_cache(maxsize=None)
+def get_s3():
+    """S3 client for the recommendation snapshot, reused across TTL reloads."""
+    return boto3.client("s3", region_name=REGION)
+
+class RequestTrace:
+    """Structured timing events for one request, from LF1 enqueue to SES delivery."""
+
+    def __init__(self, message, tier):
+        attributes = message.get("MessageAttributes", {})
+        self.tier = tier
+        system_attributes = message.get("Attributes", {})
+        self.received_at = int(time.time() * 1000)
+        self.request_id = attributes.get("RequestId", {}).get("StringValue") or message.get("MessageId")
+
+        # Messages sent before LF1 attached a trace context still have SQS's own send time
+        enqueued_at = attributes.get("EnqueuedAt", {}).get("StringValue") or system_attributes.get("SentTimestamp")
+        self.enqueued_at = int(enqueued_at) if enqueued_at else None
+        self.receive_count = int(system_attributes.get("ApproximateReceiveCount", 1))
+        self.spans = {}
+
+        self.emit("received", queue_dwell_ms=self.since_enqueue(self.received_at),
+                  receive_count=self.receive_count, urgency_tier=tier,
+                  minutes_until_dining=attributes.get("MinutesUntilDining", {}).get("StringValue"))
+
+    def since_enqueue(self, timestamp_ms):
+        return timestamp_ms - self.enqueued_at if self.enqueued_at else None
+
+    def emit(self, event, **fields):
+        print(json.dumps({"type": "trace", "request_id": self.request_id, "event": event,
+                          "timestamp": int(time.time() * 1000), **fields}))
+
+    @contextmanager
+    def span(self, name, **fields):
+        """Time a stage of the worker; extra fields can be added to the yielded dict."""
+        start = time.perf_counter()
+        try:
+            yield fields
+        except Exception as e:
+            fields["error"] = type(e).__name__
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.spans[name] = self.spans.get(name, 0) + duration_ms
+            self.emit("span", span=name, duration_ms=duration_ms, **fields)
+
+    def finish(self, outcome):
+        """Emit the end-to-end latency as a structured event and as CloudWatch metrics."""
+        finished_at = int(time.time() * 1000)
+        request_to_email = self.since_enqueue(finished_at)
+        metrics = {
+            "RequestToEmailLatency": request_to_email,
+            "QueueDwellTime": self.since_enqueue(self.received_at),
+            "WorkerTime": finished_at - self.received_at
+        }
+        metrics = {name: value for name, value in metrics.items() if value is not None}
+
+        self.emit("finished", outcome=outcome, urgency_tier=self.tier, **{f"{name}_ms": value for name, value in metrics.items()},
+                  spans_ms=self.spans)
+        print(json.dumps({
+            "_aws": {
+                "Timestamp": finished_at,
+                "CloudWatchMetrics": [{
+                    "Namespace": METRICS_NAMESPACE,
+                    "Dimensions": [["Outcome"], ["UrgencyTier"]],
+                    "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in metrics]
+                }]
+            },
+            "Outcome": outcome,
+            "UrgencyTier": self.tier,
+            "request_id": self.request_id,
+            **metrics
+        }))
+
+def tier_poll_order():
+    """Tiers in weighted random order: a tier with weight w comes first w / sum(weights) of the time."""
+    return sorted(TIER_WEIGHTS, key=lambda tier: random.random() ** (1.0 / TIER_WEIGHTS[tier]), reverse=True)
 
 def get_sqs_message():
-    """Fetch a message from SQS Queue (Q1)."""
-    response = sqs.receive_message(QueueUrl=SQS_URL, MaxNumberOfMessages=1, WaitTimeSeconds=2)
-    messages = response.get("Messages", [])
-    if not messages:
-        print("No messages in SQS queue.")
+    """Fetch a message from the first non-empty tier queue, as (tier, message)."""
+    tiers = tier_poll_order()
+    for i, tier in enumerate(tiers):
+        # Short-poll the tiers ahead of the last one, so an empty tier does not cost a long poll
+        response = get_sqs().receive_message(
+            QueueUrl=SQS_QUEUE_URLS[tier], MaxNumberOfMessages=1,
+            WaitTimeSeconds=2 if i == len(tiers) - 1 else 0,
+            AttributeNames=["SentTimestamp", "ApproximateReceiveCount"], MessageAttributeNames=["All"]
+        )
+        messages = response.get("Messages", [])
+        if messages:
+            return tier, messages[0]
+
+    print("No messages in SQS queues.")
+    return None, None
+
+def delete_sqs_message(tier, receipt_handle):
+    """Delete processed message from its tier's SQS queue."""
+    get_sqs().delete_message(QueueUrl=SQS_QUEUE_URLS[tier], ReceiptHandle=receipt_handle)
+
+def read_snapshot():
+    """Read and decode the ranked recommendation snapshot (None if unavailable)."""
+    try:
+        if os.path.exists(SNAPSHOT_PATH):
+            with open(SNAPSHOT_PATH, "rb") as f:
+                payload = f.read()
+        else:
+            payload = get_s3().get_object(Bucket=SNAPSHOT_BUCKET, Key=SNAPSHOT_KEY)["Body"].read()
+        snapshot = json.loads(gzip.decompress(payload))
+    except Exception as e:
+        print(f" Recommendation snapshot unavailable: {e}")
         return None
-    return messages[0]
-
-def delete_sqs_message(receipt_handle):
-    """Delete processed message from SQS queue."""
-    sqs.delete_message(QueueUrl=SQS_URL, ReceiptHandle=receipt_handle)
-
-def get_restaurant_recommendation(cuisine):
-    """Fetch a random restaurant from OpenSearch based on cuisine."""
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_search"
-    headers = {"Content-Type": "application/json"}
-    query = {
-        "size": 5,
-        "query": {
-            "match": {
-                "Cuisine": cuisine
-            }
-        }
-    }
-    response = requests.get(url, auth=awsauth, json=query, headers=headers)
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        print(f" Unsupported snapshot version {snapshot.get('version')}.")
+        return None
+
+    print(f" Loaded recommendation snapshot generated at {snapshot.get('generated_at')}")
+    return snapshot["recommendations"]
+
+def load_snapshot():
+    """
+    Cached snapshot, reloaded every SNAPSHOT_TTL_SECONDS. A failed load is retried after
+    SNAPSHOT_RETRY_SECONDS and keeps serving the previous snapshot, if any, meanwhile.
+    """
+    now = time.monotonic()
+    if now < _snapshot_cache["expires_at"]:
+        return _snapshot_cache["recommendations"]
+
+    recommendations = read_snapshot()
+    if recommendations is None:
+        _snapshot_cache["expires_at"] = now + SNAPSHOT_RETRY_SECONDS
+    else:
+        _snapshot_cache.update(recommendations=recommendations, expires_at=now + SNAPSHOT_TTL_SECONDS)
+    return _snapshot_cache["recommendations"]
+
+def get_snapshot_recommendation(city, cuisine):
+    """Sample a restaurant from the snapshot's ranked list by the weight the build step derived from its score."""
+    recommendations = load_snapshot()
+    if not recommendations or not city:
+        return None
+
+    candidates = recommendations.get(f"{city.strip().lower()}|{cuisine.strip().lower()}")
+    if not candidates:
+        return None
+
+    weights = [row[4] for row in candidates]
+    business_id, name, address, _, _ = random.choices(candidates, weights=weights if any(weights) else None)[0]
+    return {"RestaurantID": business_id, "Name": name, "Address": address}
+
+def get_restaurant_recommendation(cuisine, city=None):
+    """
+    Fetch a random restaurant from OpenSearch based on cuisine, filtered to the user's city.
+    Returns None when nothing matches and raises OpenSearchUnavailable when OpenSearch fails.
+    """
+    query = build_recommendation_query(cuisine, city)
+    start = time.perf_counter()
+    try:
+        response = opensearch().get(f"{INDEX_NAME}/_search", json=query)
+    except Exception as e:  # Timeouts, connection errors, credential problems
+        print(f" OpenSearch unavailable after {time.perf_counter() - start:.2f}s: {e}")
+        raise OpenSearchUnavailable(str(e)) from e
+
+    elapsed = time.perf_counter() - start
+    if elapsed > OPENSEARCH_LATENCY_THRESHOLD:
+        print(f" OpenSearch answered in {elapsed:.2f}s, over the {OPENSEARCH_LATENCY_THRESHOLD}s threshold")
+
     if response.status_code != 200:
         print(f" OpenSearch error: {response.text}")
-        return None
+        raise OpenSearchUnavailable(f"HTTP {response.status_code}")
 
     hits = response.json().get("hits", {}).get("hits", [])
     if not hits:
-        print(f"No restaurants found for cuisine: {cuisine}")
+        print(f"No restaurants found for cuisine: {cuisine} in {city or 'any city'}")
         return None
     
     return random.choice(hits)["_source"]
 
+def query_restaurant_index(index_name, partition_key, partition_value):
+    """Read a few items from a GSI partition, starting at a random SampleKey."""
+    start = Decimal(str(round(random.random(), 6)))
+    params = {
+        "IndexName": index_name,
+        "ExpressionAttributeValues": {":key": partition_value, ":start": start},
+        "Limit": FALLBACK_CANDIDATES
+    }
+    items = get_table().query(
+        KeyConditionExpression=f"{partition_key} = :key AND SampleKey >= :start", **params
+    ).get("Items", [])
+
+    # Started near the end of the partition: wrap around to its beginning
+    if len(items) < FALLBACK_CANDIDATES:
+        items += get_table().query(
+            KeyConditionExpression=f"{partition_key} = :key AND SampleKey < :start", **params
+        ).get("Items", [])
+    return items
+
+def get_fallback_recommendation(city, cuisine):
+    """
+    Pick a random restaurant from the DynamoDB GSIs when OpenSearch is down or slow.
+    The cuisine-only index is used only without a city, so users never get another city's restaurant.
+    """
+    cuisine = cuisine.strip().lower()
+    try:
+        if city:
+            items = query_restaurant_index(CITY_CUISINE_INDEX, "CityCuisine", f"{city.strip().lower()}#{cuisine}")
+        else:
+            items = query_restaurant_index(CUISINE_INDEX, "Cuisine", cuisine)
+    except Exception as e:
+        print(f" DynamoDB fallback failed: {e}")
+        return None
+
+    if not items:
+        print(f"No restaurants found in DynamoDB fallback for cuisine: {cuisine}")
+        return None
+
+    item = random.choice(items)
+    print(f" Served recommendation from DynamoDB fallback for cuisine: {cuisine}")
+    return {"RestaurantID": item["BusinessID"], "Name": item.get("Name"), "Address": item.get("Address")}
+
 def get_restaurant_details(restaurant_id):
     """Fetch restaurant details from DynamoDB."""
-    response = table.get_item(Key={"BusinessID": restaurant_id})
+    response = get_table().get_item(Key={"BusinessID": restaurant_id})
     return response.get("Item", {})
 
 def send_email(to_email, subject, body):
     """Send recommendation email using AWS SES."""
-    response = ses.send_email(
+    response = get_ses().send_email(
         Source=SES_SENDER_EMAIL,
         Destination={"ToAddresses": [to_email]},
         Message={
@@ -80,31 +307,49 @@ def send_email(to_email, subject, body):
     )
     return response
 
-def lambda_handler(event, context):
-    """Main Lambda handler for processing queue and sending recommendations."""
-    
-    message = get_sqs_message()
-    if not message:
-        return {"statusCode": 200, "body": json.dumps("No messages to process")}
-
+def process_message(tier, message, trace):
+    """Recommend a restaurant for one queued request and email it."""
     receipt_handle = message["ReceiptHandle"]
     body = json.loads(message["Body"])
     cuisine = body.get("cuisine")
     email = body.get("email")
+    location = body.get("location")
 
     if not cuisine or not email:
         print(" Missing data in SQS message. Deleting it.")
-        delete_sqs_message(receipt_handle)
+        delete_sqs_message(tier, receipt_handle)
+        trace.finish("invalid")
         return {"statusCode": 400, "body": json.dumps("Invalid SQS message")}
 
     print(f" Processing request for: {email}, Cuisine: {cuisine}")
 
-    restaurant = get_restaurant_recommendation(cuisine)
+    # Snapshot first (no network call), OpenSearch when the snapshot has no entry,
+    # and the DynamoDB GSIs only when OpenSearch errors or is too slow (not when it finds nothing)
+    with trace.span("snapshot") as span:
+        restaurant = get_snapshot_recommendation(location, cuisine)
+        span["found"] = restaurant is not None
+
+    if not restaurant:
+        try:
+            with trace.span("opensearch") as span:
+                restaurant = get_restaurant_recommendation(cuisine, location)
+                span["found"] = restaurant is not None
+        except OpenSearchUnavailable:
+            with trace.span("dynamodb_fallback") as span:
+                restaurant = get_fallback_recommendation(location, cuisine)
+                span["found"] = restaurant is not None
+
     if not restaurant:
-        delete_sqs_message(receipt_handle)
+        delete_sqs_message(tier, receipt_handle)
+        trace.finish("not_found")
         return {"statusCode": 404, "body": json.dumps("No restaurant found")}
 
-    restaurant_details = get_restaurant_details(restaurant["RestaurantID"])
+    # Snapshot entries already carry name and address, OpenSearch hits only the ID
+    if "Name" in restaurant:
+        restaurant_details = restaurant
+    else:
+        with trace.span("restaurant_details"):
+            restaurant_details = get_restaurant_details(restaurant["RestaurantID"])
     restaurant_name = restaurant_details.get("Name", "Unknown Restaurant")
     address = restaurant_details.get("Address", "Unknown Address")
 
@@ -121,11 +366,27 @@ def lambda_handler(event, context):
     Enjoy your meal! 
     """
 
-    send_email(email, subject, email_body)
+    with trace.span("ses_send"):
+        send_email(email, subject, email_body)
     print(f" Email sent to {email}")
 
-    delete_sqs_message(receipt_handle)
+    with trace.span("sqs_delete"):
+        delete_sqs_message(tier, receipt_handle)
+    trace.finish("email_sent")
 
     return {"statusCode": 200, "body": json.dumps("Email sent successfully")}
 
+def lambda_handler(event, context):
+    """Main Lambda handler for processing queue and sending recommendations."""
+    
+    tier, message = get_sqs_message()
+    if not message:
+        return {"statusCode": 200, "body": json.dumps("No messages to process")}
 
+    trace = RequestTrace(message, tier)
+    try:
+        return process_message(tier, message, trace)
+    except Exception:
+        # Failed and retried requests are the ones the latency SLO most needs to see
+        trace.finish("error")
+        raise
@@ -0,0 +1,127 @@
+import boto3
+
+# Shared OpenSearch client for every Lambda that talks to the `restaurants` index.
+# Bundle this file next to each lambda_function.py (or publish it as a Lambda layer).
+# requests / requests_aws4auth are imported when the first client is built, so
+# handlers that never reach OpenSearch do not pay for them at cold start.
+
+# Connection Defaults
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = (429, 502, 503, 504)
+
+# One client per (host, region, settings), reused across warm invocations
+_clients = {}
+
+
+class OpenSearchClient:
+    """Keep-alive OpenSearch HTTP client with a pooled session and SigV4 signing."""
+
+    def __init__(self, host, region, service="es", pool_size=POOL_SIZE,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES,
+                 backoff_factor=BACKOFF_FACTOR):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests_aws4auth import AWS4Auth
+        from urllib3.util.retry import Retry
+
+        credentials = boto3.Session().get_credentials()
+        if credentials is None:
+            raise ValueError("AWS Credentials not found. Check IAM role permissions.")
+
+        self.host = host.rstrip("/")
+        self.timeout = timeout
+
+        # Signing with the refreshable credentials object (instead of a frozen
+        # access key / token) re-reads them before expiry on every request.
+        self.auth = AWS4Auth(region=region, service=service, refreshable_credentials=credentials)
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["HEAD", "GET", "PUT", "POST", "DELETE"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, path, **kwargs):
+        """Send a signed request to `path` (relative to the domain endpoint)."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.host}/{path.lstrip('/')}", **kwargs)
+
+    def head(self, path, **kwargs):
+        return self.request("HEAD", path, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+
+def get_client(host, region, **kwargs):
+    """Return the shared client for `host` and these settings, creating it on first use."""
+    key = (host, region, tuple(sorted(kwargs.items())))
+    if key not in _clients:
+        _clients[key] = OpenSearchClient(host, region, **kwargs)
+    return _clients[key]
+
+
+
+# Field mappings of the `restaurants` index
+RESTAURANT_PROPERTIES = {
+    "RestaurantID": {"type": "keyword"},
+    "Cuisine": {"type": "keyword"},
+    "City": {"type": "keyword"},
+    "Location": {"type": "geo_point"}
+}
+
+# Centroids of the supported cities, used to prune candidates on the server side
+CITY_CENTROIDS = {
+    "new york": {"lat": 40.7128, "lon": -74.0060},
+    "seattle": {"lat": 47.6062, "lon": -122.3321},
+    "san francisco": {"lat": 37.7749, "lon": -122.4194},
+    "chicago": {"lat": 41.8781, "lon": -87.6298},
+    "boston": {"lat": 42.3601, "lon": -71.0589},
+    "miami": {"lat": 25.7617, "lon": -80.1918}
+}
+CITY_RADIUS = "40km"
+
+
+def build_recommendation_query(cuisine, city=None, size=5):
+    """Query the SQStoSES worker sends to pick recommendation candidates.
+
+    Everything is a filter (no scoring, cacheable): the cuisine, the city when
+    known, and a radius around the city centroid that drops restaurants whose
+    Yelp search location did not match where they actually are.
+    """
+    filters = [{"term": {"Cuisine": cuisine.strip().lower()}}]
+    if city:
+        city = city.strip().lower()
+        filters.append({"term": {"City": city}})
+        if city in CITY_CENTROIDS:
+            filters.append({"geo_distance": {"distance": CITY_RADIUS, "Location": CITY_CENTROIDS[city]}})
+    return {
+        "size": size,
+        "query": {
+            "bool": {
+                "filter": filters
+            }
+        }
+    }
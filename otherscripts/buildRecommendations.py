@@ -0,0 +1,123 @@
+import json
+import boto3
+import datetime
+import gzip
+import math
+from decimal import Decimal
+from functools import lru_cache
+
+# AWS Resources
+REGION = "your-region"
+DYNAMODB_TABLE = "your-dynamodb-table"
+SNAPSHOT_BUCKET = "your-snapshot-bucket"
+SNAPSHOT_KEY = "recommendations/snapshot.json.gz"
+
+# Snapshot Configuration
+SNAPSHOT_VERSION = 2      # Bump when the snapshot layout changes; the worker rejects other versions
+TOP_N = 50                # Restaurants kept per (city, cuisine)
+PRIOR_REVIEWS = 50        # Bayesian prior weight, in "virtual reviews" at the group's mean rating
+WEIGHT_SHARPNESS = 3.0    # Sampling weight falls by e^3 (~20x) per rating point below the group's best
+
+@lru_cache(maxsize=None)
+def get_table():
+    """ Connect to the DynamoDB table on first use """
+    return boto3.resource("dynamodb", region_name=REGION).Table(DYNAMODB_TABLE)
+
+def scan_restaurants():
+    """ Read every restaurant, projecting only the fields the snapshot needs """
+    items = []
+    scan_params = {
+        "ProjectionExpression": "BusinessID, #n, Address, Cuisine, City, Rating, NumberOfReviews",
+        "ExpressionAttributeNames": {"#n": "Name"}
+    }
+
+    while True:
+        response = get_table().scan(**scan_params)
+        items.extend(response.get("Items", []))
+        if not response.get("LastEvaluatedKey"):
+            break
+        scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"Scanned {len(items)} restaurants from DynamoDB")
+    return items
+
+def bayesian_score(rating, reviews, mean_rating, prior_reviews=PRIOR_REVIEWS):
+    """ Rating shrunk towards the group mean; restaurants with few reviews move the most """
+    return (reviews * rating + prior_reviews * mean_rating) / (reviews + prior_reviews)
+
+def sampling_weight(score, best_score, sharpness=WEIGHT_SHARPNESS):
+    """ Worker sampling weight; raw scores all sit around 3-5, which would sample almost uniformly """
+    return math.exp(sharpness * (score - best_score))
+
+def build_snapshot(items, top_n=TOP_N, prior_reviews=PRIOR_REVIEWS):
+    """ Rank restaurants per (city, cuisine) and keep the top N of each group """
+    groups = {}
+    for item in items:
+        # Items without City predate it; createTableIndexes.py's backfill action fills it in
+        if not item.get("BusinessID") or not item.get("Cuisine") or not item.get("City"):
+            continue
+        city = str(item["City"]).strip().lower()
+        key = f"{city}|{str(item['Cuisine']).strip().lower()}"
+        groups.setdefault(key, []).append(item)
+
+    recommendations = {}
+    for key, group in groups.items():
+        ratings = [float(item.get("Rating", 0)) for item in group]
+        mean_rating = sum(ratings) / len(ratings)
+
+        scored = []
+        for item, rating in zip(group, ratings):
+            score = bayesian_score(rating, float(item.get("NumberOfReviews", 0)), mean_rating, prior_reviews)
+            scored.append((score, item))
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        best_score = scored[0][0]
+
+        # Compact rows: [BusinessID, Name, Address, score, sampling weight]
+        recommendations[key] = [
+            [item["BusinessID"], item.get("Name", ""), item.get("Address", ""), round(score, 3),
+             round(sampling_weight(score, best_score), 6)]
+            for score, item in scored[:top_n]
+        ]
+
+    return {
+        "version": SNAPSHOT_VERSION,
+        "generated_at": datetime.datetime.utcnow().isoformat() + "Z",
+        "top_n": top_n,
+        "prior_reviews": prior_reviews,
+        "weight_sharpness": WEIGHT_SHARPNESS,
+        "recommendations": recommendations
+    }
+
+def serialize_snapshot(snapshot):
+    """ Compact, gzip-compressed JSON """
+    def default(value):
+        if isinstance(value, Decimal):
+            return float(value)
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    return gzip.compress(json.dumps(snapshot, separators=(",", ":"), default=default).encode("utf-8"))
+
+def lambda_handler(event, context):
+    """ Scheduled entry point: rebuild the snapshot and publish it to S3 (or a local file) """
+    snapshot = build_snapshot(
+        scan_restaurants(),
+        top_n=event.get("top_n", TOP_N),
+        prior_reviews=event.get("prior_reviews", PRIOR_REVIEWS)
+    )
+    payload = serialize_snapshot(snapshot)
+    groups = len(snapshot["recommendations"])
+
+    if event.get("output_path"):
+        with open(event["output_path"], "wb") as f:
+            f.write(payload)
+        destination = event["output_path"]
+    else:
+        bucket = event.get("bucket", SNAPSHOT_BUCKET)
+        key = event.get("key", SNAPSHOT_KEY)
+        boto3.client("s3", region_name=REGION).put_object(
+            Bucket=bucket, Key=key, Body=payload, ContentType="application/gzip"
+        )
+        destination = f"s3://{bucket}/{key}"
+
+    print(f"Wrote snapshot v{SNAPSHOT_VERSION} with {groups} (city, cuisine) groups, {len(payload)} bytes, to {destination}")
+    return {"statusCode": 200, "body": json.dumps(f"Snapshot with {groups} groups written to {destination}")}
@@ -0,0 +1,130 @@
+import json
+import boto3
+import random
+import time
+from decimal import Decimal
+from functools import lru_cache
+
+# AWS Resources
+REGION = "your-region"
+DYNAMODB_TABLE = "your-dynamodb-table"
+
+# Global secondary indexes used by the SQStoSES fallback when OpenSearch is unavailable.
+# SampleKey is a random number per item, so a query can start at a random point in a partition.
+INDEX_PROJECTION = ["Name", "Address", "Rating", "NumberOfReviews"]
+GLOBAL_SECONDARY_INDEXES = [
+    {"IndexName": "CityCuisineIndex", "PartitionKey": "CityCuisine"},
+    {"IndexName": "CuisineIndex", "PartitionKey": "Cuisine"},
+]
+GSI_READ_CAPACITY = 5   # Only used when the table is in provisioned mode
+GSI_WRITE_CAPACITY = 5
+DEFAULT_CITY = "new york"  # Items stored before City was recorded came from restaruantData.py's default location
+
+@lru_cache(maxsize=None)
+def get_client():
+    """ DynamoDB client on first use """
+    return boto3.client("dynamodb", region_name=REGION)
+
+@lru_cache(maxsize=None)
+def get_table():
+    """ DynamoDB table resource on first use """
+    return boto3.resource("dynamodb", region_name=REGION).Table(DYNAMODB_TABLE)
+
+def wait_for_indexes(poll_seconds=15):
+    """ Block until the table and all of its GSIs are ACTIVE """
+    while True:
+        table = get_client().describe_table(TableName=DYNAMODB_TABLE)["Table"]
+        pending = [i["IndexName"] for i in table.get("GlobalSecondaryIndexes", []) if i["IndexStatus"] != "ACTIVE"]
+        if table["TableStatus"] == "ACTIVE" and not pending:
+            return table
+        print(f"Waiting for table / indexes to become ACTIVE: {pending or table['TableStatus']}")
+        time.sleep(poll_seconds)
+
+def create_indexes():
+    """
+    Create any missing GSI. DynamoDB accepts one GSI creation per UpdateTable call,
+    so each index is created and backfilled before the next one is requested.
+    """
+    table = wait_for_indexes()
+    existing = {i["IndexName"] for i in table.get("GlobalSecondaryIndexes", [])}
+    provisioned = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED") == "PROVISIONED"
+    created = []
+
+    for index in GLOBAL_SECONDARY_INDEXES:
+        if index["IndexName"] in existing:
+            print(f"Index `{index['IndexName']}` already exists, skipping creation.")
+            continue
+
+        definition = {
+            "IndexName": index["IndexName"],
+            "KeySchema": [
+                {"AttributeName": index["PartitionKey"], "KeyType": "HASH"},
+                {"AttributeName": "SampleKey", "KeyType": "RANGE"}
+            ],
+            "Projection": {"ProjectionType": "INCLUDE", "NonKeyAttributes": INDEX_PROJECTION}
+        }
+        if provisioned:
+            definition["ProvisionedThroughput"] = {
+                "ReadCapacityUnits": GSI_READ_CAPACITY,
+                "WriteCapacityUnits": GSI_WRITE_CAPACITY
+            }
+
+        get_client().update_table(
+            TableName=DYNAMODB_TABLE,
+            AttributeDefinitions=[
+                {"AttributeName": index["PartitionKey"], "AttributeType": "S"},
+                {"AttributeName": "SampleKey", "AttributeType": "N"}
+            ],
+            GlobalSecondaryIndexUpdates=[{"Create": definition}]
+        )
+        print(f"Creating index `{index['IndexName']}`...")
+        wait_for_indexes()
+        created.append(index["IndexName"])
+
+    return {"statusCode": 200, "body": json.dumps(f"Created indexes: {created or 'none'}")}
+
+def backfill_index_attributes():
+    """
+    Add City, CityCuisine and SampleKey to items written before ingestion populated them
+    """
+    scan_params = {"ProjectionExpression": "BusinessID, Cuisine, City, CityCuisine, SampleKey"}
+    updated = 0
+
+    while True:
+        response = get_table().scan(**scan_params)
+        for item in response.get("Items", []):
+            if not item.get("Cuisine") or (item.get("City") and item.get("CityCuisine")
+                                           and item.get("SampleKey") is not None):
+                continue
+            city = item.get("City") or DEFAULT_CITY
+            get_table().update_item(
+                Key={"BusinessID": item["BusinessID"]},
+                UpdateExpression="SET City = :city, CityCuisine = :city_cuisine, "
+                                 "SampleKey = if_not_exists(SampleKey, :sample_key)",
+                ExpressionAttributeValues={
+                    ":city": city,
+                    ":city_cuisine": f"{city}#{item['Cuisine']}",
+                    ":sample_key": Decimal(str(round(random.random(), 6)))
+                }
+            )
+            updated += 1
+
+        if not response.get("LastEvaluatedKey"):
+            break
+        scan_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    print(f"Backfilled index attributes on {updated} items.")
+    return {"statusCode": 200, "body": json.dumps(f"Backfilled {updated} items")}
+
+def lambda_handler(event, context):
+    """
+    Lambda entry point function
+    """
+    action = event.get("action")
+
+    if action == "create_indexes":
+        return create_indexes()
+    elif action == "backfill":
+        return backfill_index_attributes()
+    else:
+        return {"statusCode": 400, "body": json.dumps("Invalid action, please provide 'create_indexes' or 'backfill'")}
@@ -1,31 +1,19 @@
 import json
-import requests
-from requests_aws4auth import AWS4Auth
+from opensearch_client import get_client
 import boto3
+from functools import lru_cache
 
 # OpenSearch Configuration
 REGION = "us-east-1"
 OPENSEARCH_HOST = "https://your-opensearch-endpoint.amazonaws.com"  # Replace with your OpenSearch domain
 INDEX_NAME = "restaurants"
 
-# AWS Authentication
-session = boto3.Session()
-credentials = session.get_credentials()
-
-if credentials is None:
-    raise ValueError(" Unable to retrieve AWS credentials. Please check IAM role permissions.")
-
-awsauth = AWS4Auth(
-    credentials.access_key,
-    credentials.secret_key,
-    REGION,
-    "es",
-    session_token=credentials.token
-)
-
-# Connect to DynamoDB
-dynamodb = boto3.resource("dynamodb", region_name=REGION)
-table = dynamodb.Table("yelp-restaurants")  # Ensure the correct table name
+@lru_cache(maxsize=None)
+def get_table():
+    """
+    Connect to DynamoDB on first use
+    """
+    return boto3.resource("dynamodb", region_name=REGION).Table("yelp-restaurants")  # Ensure the correct table name
 
 def fetch_data_from_dynamodb():
     """
@@ -41,7 +29,7 @@ def fetch_data_from_dynamodb():
         if last_evaluated_key:
             scan_params["ExclusiveStartKey"] = last_evaluated_key
 
-        response = table.scan(**scan_params)
+        response = get_table().scan(**scan_params)
         items.extend(response.get("Items", []))
 
         last_evaluated_key = response.get("LastEvaluatedKey")
@@ -52,30 +40,44 @@ def fetch_data_from_dynamodb():
     return items
 
 
+def build_document(item):
+    """
+    Project a DynamoDB item onto the indexed fields (None if it cannot be indexed).
+    """
+    restaurant_id = item.get("BusinessID")
+    cuisine = item.get("Cuisine")
+    if not restaurant_id or not cuisine:
+        return None
+
+    document = {"RestaurantID": restaurant_id, "Cuisine": cuisine}
+    # Older items get City from createTableIndexes.py's backfill action
+    if item.get("City"):
+        document["City"] = str(item["City"]).strip().lower()
+    coordinates = item.get("Coordinates") or {}
+    if coordinates.get("latitude") is not None and coordinates.get("longitude") is not None:
+        document["Location"] = {"lat": float(coordinates["latitude"]), "lon": float(coordinates["longitude"])}
+    return document
+
+
 def insert_into_opensearch(data):
     """
     Insert data into OpenSearch in bulk.
     """
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_bulk"
-    headers = {"Content-Type": "application/json"}
-
     bulk_data = ""
     for item in data:
-        restaurant_id = item.get("BusinessID")
-        cuisine = item.get("Cuisine")
-
-        if not restaurant_id or not cuisine:
+        document = build_document(item)
+        if not document:
             continue  # Skip invalid data
 
         # OpenSearch bulk insert format
-        bulk_data += json.dumps({"index": {"_index": INDEX_NAME, "_id": restaurant_id}}) + "\n"
-        bulk_data += json.dumps({"RestaurantID": restaurant_id, "Cuisine": cuisine}) + "\n"
+        bulk_data += json.dumps({"index": {"_index": INDEX_NAME, "_id": document["RestaurantID"]}}) + "\n"
+        bulk_data += json.dumps(document) + "\n"
 
     if not bulk_data:
         print("No valid data available for OpenSearch insertion.")
         return {"statusCode": 400, "body": json.dumps("No valid data to insert")}
 
-    response = requests.post(url, auth=awsauth, data=bulk_data, headers=headers)
+    response = get_client(OPENSEARCH_HOST, REGION).post(f"{INDEX_NAME}/_bulk", data=bulk_data)
 
     if response.status_code == 200:
         print(" Data successfully inserted into OpenSearch!")
@@ -1,36 +1,29 @@
 import json
+import gzip
+import itertools
+import sys
+import time
 import requests
-from requests_aws4auth import AWS4Auth
-import boto3
+from opensearch_client import RESTAURANT_PROPERTIES, get_client, build_recommendation_query
 
 # OpenSearch Configuration
 REGION = "your-region"
 OPENSEARCH_HOST = "https://your-opensearch-domain.com"
 INDEX_NAME = "restaurants"
 
-# AWS Authentication
-session = boto3.Session()
-credentials = session.get_credentials()
+# Export Configuration
+EXPORT_PAGE_SIZE = 1000
+EXPORT_KEEP_ALIVE = "2m"
 
-if credentials is None:
-    raise ValueError("AWS Credentials not found. Check IAM role permissions.")
-
-awsauth = AWS4Auth(
-    credentials.access_key,
-    credentials.secret_key,
-    REGION,
-    "es",
-    session_token=credentials.token
-)
+# Stats Configuration
+PROBE_ITERATIONS = 50
+PROBE_CUISINES = ['italian', 'chinese', 'mexican', 'indian', 'american', 'japanese']
 
 def check_index_exists():
     """
     Check if the `restaurants` index exists in OpenSearch
     """
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}"
-    headers = {"Content-Type": "application/json"}
-
-    response = requests.head(url, auth=awsauth, headers=headers)
+    response = get_client(OPENSEARCH_HOST, REGION).head(INDEX_NAME)
 
     if response.status_code == 200:
         print(f"Index `{INDEX_NAME}` exists.")
@@ -49,23 +42,17 @@ def create_index():
     if check_index_exists():
         return {"statusCode": 200, "body": json.dumps(f"Index `{INDEX_NAME}` already exists, skipping creation.")}
 
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}"
-    headers = {"Content-Type": "application/json"}
-
     index_settings = {
         "settings": {
             "number_of_shards": 1,
             "number_of_replicas": 1
         },
         "mappings": {
-            "properties": {
-                "RestaurantID": {"type": "keyword"},
-                "Cuisine": {"type": "keyword"}
-            }
+            "properties": RESTAURANT_PROPERTIES
         }
     }
 
-    response = requests.put(url, auth=awsauth, json=index_settings, headers=headers)
+    response = get_client(OPENSEARCH_HOST, REGION).put(INDEX_NAME, json=index_settings)
 
     if response.status_code in [200, 201]:
         print("Index created successfully!")
@@ -75,12 +62,26 @@ def create_index():
         print("Response:", response.text)
         return {"statusCode": response.status_code, "body": json.dumps(response.text)}
 
+def update_mapping():
+    """
+    Add new fields (e.g. City, Location) to the mapping of an existing index.
+    Existing documents pick them up when OSData re-inserts them.
+    """
+    response = get_client(OPENSEARCH_HOST, REGION).put(f"{INDEX_NAME}/_mapping",
+                                                       json={"properties": RESTAURANT_PROPERTIES})
+
+    if response.status_code == 200:
+        print("Index mapping updated successfully!")
+        return {"statusCode": 200, "body": json.dumps(f"Index `{INDEX_NAME}` mapping updated successfully!")}
+    else:
+        print(f"Failed to update mapping - Status Code: {response.status_code}")
+        print("Response:", response.text)
+        return {"statusCode": response.status_code, "body": json.dumps(response.text)}
+
 def fetch_all_documents():
     """
     Retrieve all documents from the OpenSearch `restaurants` index
     """
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}/_search"
-    headers = {"Content-Type": "application/json"}
     query = {
         "size": 1000,  # Limit to 1000 results
         "query": {
@@ -88,7 +89,7 @@ def fetch_all_documents():
         }
     }
 
-    response = requests.get(url, auth=awsauth, json=query, headers=headers)
+    response = get_client(OPENSEARCH_HOST, REGION).get(f"{INDEX_NAME}/_search", json=query)
 
     if response.status_code == 200:
         data = response.json()
@@ -105,6 +106,258 @@ def fetch_all_documents():
         print("Response:", response.text)
         return {"statusCode": response.status_code, "body": json.dumps(response.text)}
 
+def _open_point_in_time():
+    """
+    Open a point-in-time on the `restaurants` index so paging sees a consistent snapshot
+    """
+    response = get_client(OPENSEARCH_HOST, REGION).post(f"{INDEX_NAME}/_search/point_in_time",
+                                                        params={"keep_alive": EXPORT_KEEP_ALIVE})
+    response.raise_for_status()
+    return response.json()["pit_id"]
+
+def _close_point_in_time(pit_id):
+    """
+    Release the point-in-time so the cluster can free the pinned segments
+    """
+    response = get_client(OPENSEARCH_HOST, REGION).delete("_search/point_in_time", json={"pit_id": [pit_id]})
+    if response.status_code != 200:
+        print(f"Failed to close point-in-time - Status Code: {response.status_code} - Response: {response.text}")
+
+def iter_all_documents(fields=None, page_size=EXPORT_PAGE_SIZE):
+    """
+    Yield every document `_source` in the index, one page at a time.
+
+    Pages are read from a point-in-time with `search_after`, so there is no
+    10,000 hit window and only one page is held in memory at once.
+    """
+    pit_id = _open_point_in_time()
+    search_after = None
+
+    try:
+        while True:
+            query = {
+                "size": page_size,
+                "query": {"match_all": {}},
+                "pit": {"id": pit_id, "keep_alive": EXPORT_KEEP_ALIVE},
+                # RestaurantID is a unique keyword, a stable search_after key on every OpenSearch version
+                "sort": [{"RestaurantID": "asc"}],
+                "_source": fields if fields else True
+            }
+            if search_after is not None:
+                query["search_after"] = search_after
+
+            response = get_client(OPENSEARCH_HOST, REGION).post("_search", json=query)
+            response.raise_for_status()
+            data = response.json()
+
+            # The PIT id may change between pages, always continue with the latest one
+            pit_id = data.get("pit_id", pit_id)
+            hits = data.get("hits", {}).get("hits", [])
+            if not hits:
+                break
+
+            for hit in hits:
+                yield hit.get("_source", {})
+
+            if len(hits) < page_size:
+                break
+            search_after = hits[-1]["sort"]
+    finally:
+        _close_point_in_time(pit_id)
+
+def export_documents(output, fields=None, compress=False, page_size=EXPORT_PAGE_SIZE):
+    """
+    Stream the whole index as NDJSON to a file path or a binary output stream.
+
+    Returns export statistics: document count, bytes written and throughput.
+    """
+    start = time.perf_counter()
+    count = 0
+    written = 0
+
+    if isinstance(output, str):
+        stream = gzip.open(output, "wb") if compress else open(output, "wb")
+    else:
+        stream = gzip.GzipFile(fileobj=output, mode="wb") if compress else output
+
+    try:
+        for source in iter_all_documents(fields=fields, page_size=page_size):
+            line = (json.dumps(source, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+            stream.write(line)
+            count += 1
+            written += len(line)
+    finally:
+        # Close our own file handles / gzip wrappers, but leave caller-owned streams open
+        if isinstance(output, str) or compress:
+            stream.close()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "documents": count,
+        "bytes": written,
+        "seconds": round(elapsed, 3),
+        "docs_per_second": round(count / elapsed, 1) if elapsed else None,
+        "mb_per_second": round(written / elapsed / 1_000_000, 3) if elapsed else None,
+        "compressed": compress
+    }
+    print(f"Exported {count} documents ({written} bytes uncompressed) in {stats['seconds']}s "
+          f"- {stats['docs_per_second']} docs/s", file=sys.stderr)
+    return stats
+
+def export_all_documents(event):
+    """
+    Export the index as NDJSON for the `export` action
+    """
+    compress = event.get("gzip", False)
+    default_path = "/tmp/restaurants.ndjson.gz" if compress else "/tmp/restaurants.ndjson"
+    output_path = event.get("output_path", default_path)
+
+    try:
+        stats = export_documents(
+            output_path,
+            fields=event.get("fields"),
+            compress=compress,
+            page_size=event.get("page_size", EXPORT_PAGE_SIZE)
+        )
+    except requests.exceptions.RequestException as e:
+        print(f"Export failed: {e}")
+        return {"statusCode": 500, "body": json.dumps(f"Export failed: {e}")}
+
+    stats["output_path"] = output_path
+    return {"statusCode": 200, "body": json.dumps(stats)}
+
+def _percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))  # ceil without floats
+    return sorted_values[rank - 1]
+
+def _summarize_latencies(samples):
+    """
+    Summarize latency samples (milliseconds) as p50/p95/p99
+    """
+    ordered = sorted(samples)
+    return {
+        "p50": _percentile(ordered, 50),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "max": ordered[-1] if ordered else None
+    }
+
+def get_document_counts():
+    """
+    Count documents per cuisine and per city with a single aggregation query
+    """
+    query = {
+        "size": 0,
+        "track_total_hits": True,
+        "aggs": {
+            "by_cuisine": {"terms": {"field": "Cuisine", "size": 100}},
+            "by_city": {"terms": {"field": "City", "size": 100}}
+        }
+    }
+    response = get_client(OPENSEARCH_HOST, REGION).post(f"{INDEX_NAME}/_search", json=query)
+    response.raise_for_status()
+    data = response.json()
+    aggregations = data.get("aggregations", {})
+
+    def buckets(name):
+        return {b["key"]: b["doc_count"] for b in aggregations.get(name, {}).get("buckets", [])}
+
+    return {
+        "total": data.get("hits", {}).get("total", {}).get("value"),
+        "by_cuisine": buckets("by_cuisine"),
+        "by_city": buckets("by_city")
+    }
+
+def get_storage_stats():
+    """
+    Report index size, segment counts and per-shard placement
+    """
+    response = get_client(OPENSEARCH_HOST, REGION).get(f"{INDEX_NAME}/_stats/docs,store,segments")
+    response.raise_for_status()
+    index_stats = response.json().get("_all", {})
+    primaries = index_stats.get("primaries", {})
+    total = index_stats.get("total", {})
+
+    shards_response = get_client(OPENSEARCH_HOST, REGION).get(f"_cat/shards/{INDEX_NAME}",
+                                                              params={"format": "json", "bytes": "b"})
+    shards_response.raise_for_status()
+
+    return {
+        "size_bytes": total.get("store", {}).get("size_in_bytes"),
+        "primary_size_bytes": primaries.get("store", {}).get("size_in_bytes"),
+        "deleted_docs": primaries.get("docs", {}).get("deleted"),
+        "segment_count": primaries.get("segments", {}).get("count"),
+        "segment_memory_bytes": primaries.get("segments", {}).get("memory_in_bytes"),
+        "shards": [
+            {
+                "shard": shard.get("shard"),
+                "primary": shard.get("prirep") == "p",
+                "state": shard.get("state"),
+                "docs": shard.get("docs"),
+                "store_bytes": shard.get("store"),
+                "node": shard.get("node")
+            }
+            for shard in shards_response.json()
+        ]
+    }
+
+def probe_query_latency(cuisines, cities, iterations=PROBE_ITERATIONS):
+    """
+    Replay the SQStoSES recommendation query `iterations` times.
+
+    Client latency includes the network and signing, `took` is the time
+    OpenSearch itself reports, so the gap between them shows where time goes.
+    """
+    client_ms = []
+    server_ms = []
+    errors = 0
+
+    # Cycle through every (cuisine, city) combination, not just the pairs at matching list positions
+    combinations = itertools.cycle(itertools.product(cuisines, cities or [None]))
+    for cuisine, city in itertools.islice(combinations, iterations):
+        query = build_recommendation_query(cuisine, city)
+        start = time.perf_counter()
+        response = get_client(OPENSEARCH_HOST, REGION).get(f"{INDEX_NAME}/_search", json=query)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        if response.status_code != 200:
+            errors += 1
+            continue
+        client_ms.append(round(elapsed, 2))
+        server_ms.append(response.json().get("took", 0))
+
+    return {
+        "iterations": iterations,
+        "errors": errors,
+        "client_ms": _summarize_latencies(client_ms),
+        "server_took_ms": _summarize_latencies(server_ms)
+    }
+
+def get_index_stats(event):
+    """
+    Collect document counts, storage stats and a query latency probe for the `stats` action
+    """
+    try:
+        counts = get_document_counts()
+        cuisines = list(counts["by_cuisine"]) or PROBE_CUISINES
+        cities = list(counts["by_city"])
+        stats = {
+            "counts": counts,
+            "storage": get_storage_stats(),
+            "latency": probe_query_latency(cuisines, cities, event.get("iterations", PROBE_ITERATIONS))
+        }
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to collect index stats: {e}")
+        return {"statusCode": 500, "body": json.dumps(f"Failed to collect index stats: {e}")}
+
+    print(f"Index stats: {json.dumps(stats)}")
+    return {"statusCode": 200, "body": json.dumps(stats, indent=2)}
+
 def lambda_handler(event, context):
     """
     Lambda entry point function
@@ -113,8 +366,20 @@ def lambda_handler(event, context):
 
     if action == "create_index":
         return create_index()
+    elif action == "update_mapping":
+        return update_mapping()
     elif action == "fetch_all":
         return fetch_all_documents()
+    elif action == "export":
+        return export_all_documents(event)
+    elif action == "stats":
+        return get_index_stats(event)
     else:
-        return {"statusCode": 400, "body": json.dumps("Invalid action, please provide 'create_index' or 'fetch_all'")}
+        return {"statusCode": 400, "body": json.dumps("Invalid action, please provide 'create_index', 'update_mapping', 'fetch_all', 'export' or 'stats'")}
+
+if __name__ == "__main__":
+    # Local usage, from the repository root (opensearch_client lives in lambdafunctions/shared):
+    # PYTHONPATH=lambdafunctions/shared python otherscripts/openSearch/checkIndex.py [fields,comma,separated] > restaurants.ndjson
+    export_fields = sys.argv[1].split(",") if len(sys.argv) > 1 else None
+    export_documents(sys.stdout.buffer, fields=export_fields)
 
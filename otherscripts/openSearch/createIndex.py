@@ -1,7 +1,6 @@
 import json
 import requests
-from requests_aws4auth import AWS4Auth
-import boto3
+from opensearch_client import RESTAURANT_PROPERTIES, get_client
 import logging
 
 # Configure logging
@@ -13,43 +12,22 @@ REGION = "your-region"
 OPENSEARCH_HOST = "https://your-opensearch-domain.com"
 INDEX_NAME = "restaurants"
 
-# AWS Authentication
-session = boto3.Session()
-credentials = session.get_credentials()
-
-if credentials is None:
-    raise ValueError("AWS Credentials not found. Check IAM role permissions.")
-
-awsauth = AWS4Auth(
-    credentials.access_key,
-    credentials.secret_key,
-    REGION,
-    "es",
-    session_token=credentials.token
-)
-
 def create_index():
     """
     Create the `restaurants` index in OpenSearch
     """
-    url = f"{OPENSEARCH_HOST}/{INDEX_NAME}"
-    headers = {"Content-Type": "application/json"}
-
     index_settings = {
         "settings": {
             "number_of_shards": 1,
             "number_of_replicas": 1
         },
         "mappings": {
-            "properties": {
-                "RestaurantID": {"type": "keyword"},
-                "Cuisine": {"type": "keyword"}
-            }
+            "properties": RESTAURANT_PROPERTIES
         }
     }
 
     try:
-        response = requests.put(url, auth=awsauth, json=index_settings, headers=headers)
+        response = get_client(OPENSEARCH_HOST, REGION).put(INDEX_NAME, json=index_settings)
 
         if response.status_code in [200, 201]:
             logger.info("Index created successfully!")
@@ -0,0 +1,130 @@
+"""
+Import-time (cold start) profile for every Lambda handler in the repo.
+
+Each handler is imported in a fresh interpreter with `-X importtime`, the
+way the Lambda runtime loads it during init. Reports the import cost per
+handler and its heaviest top-level imports, and can enforce a budget:
+
+    python otherscripts/perf/coldStart.py --budget-ms 250
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SHARED_DIR = os.path.join(REPO_ROOT, "lambdafunctions", "shared")
+
+# Handler name -> (handler file, extra directories bundled into its deployment)
+HANDLERS = {
+    "LF0": ("lambdafunctions/LF0/lambda_function.py", []),
+    "LF1": ("lambdafunctions/LF1/lambda_function.py", ["lambdafunctions/LF1"]),
+    "SQStoSES": ("lambdafunctions/SQStoSES/lambda_function.py", [SHARED_DIR]),
+    "restaruantData": ("otherscripts/restaruantData.py", []),
+    "OSData": ("otherscripts/openSearch/OSData.py", [SHARED_DIR]),
+    "QueryData": ("otherscripts/openSearch/QueryData.py", [SHARED_DIR]),
+    "checkIndex": ("otherscripts/openSearch/checkIndex.py", [SHARED_DIR]),
+    "createIndex": ("otherscripts/openSearch/createIndex.py", [SHARED_DIR]),
+}
+
+HANDLER_MARKER = "--- handler import ---"
+IMPORT_SNIPPET = """
+import importlib.util, json, sys, time
+sys.path[:0] = {paths!r}
+sys.stderr.write("{marker}\\n")
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("lambda_function", {path!r})
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+print(json.dumps({{"import_ms": (time.perf_counter() - start) * 1000}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Cumulative microseconds for each top-level import in `-X importtime` output."""
+    top_level = {}
+    # Skip the interpreter's own startup imports and those of the profiling snippet
+    stderr = stderr.split(HANDLER_MARKER, 1)[-1]
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "| imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented under the module that triggered them
+        if not name.startswith(" ") or name[1:2] == " ":
+            continue
+        top_level[name.strip()] = top_level.get(name.strip(), 0) + int(cumulative)
+    return top_level
+
+
+def profile_handler(path, extra_paths):
+    """Import one handler in a fresh interpreter and return its timings."""
+    paths = [os.path.join(REPO_ROOT, p) for p in extra_paths]
+    code = IMPORT_SNIPPET.format(paths=paths, marker=HANDLER_MARKER, path=os.path.join(REPO_ROOT, path))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, cwd=REPO_ROOT)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        return {"error": error}
+
+    imports = parse_importtime(result.stderr)
+    return {
+        "import_ms": json.loads(result.stdout.strip().splitlines()[-1])["import_ms"],
+        "imports_ms": {name: us / 1000 for name, us in imports.items()}
+    }
+
+
+def profile(names, runs):
+    """Best-of-`runs` import cost per handler, plus its heaviest imports from that run."""
+    report = {}
+    for name in names:
+        path, extra_paths = HANDLERS[name]
+        samples = [profile_handler(path, extra_paths) for _ in range(runs)]
+        ok = [s for s in samples if "error" not in s]
+        if not ok:
+            report[name] = {"error": samples[0]["error"]}
+            continue
+        best = min(ok, key=lambda s: s["import_ms"])
+        heaviest = sorted(best["imports_ms"].items(), key=lambda item: item[1], reverse=True)[:5]
+        report[name] = {
+            "import_ms": round(best["import_ms"], 1),
+            "heaviest_imports_ms": {module: round(ms, 1) for module, ms in heaviest}
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the cold-start import cost of each Lambda handler.")
+    parser.add_argument("handlers", nargs="*", help=f"any of {', '.join(HANDLERS)} (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per handler (best is kept)")
+    parser.add_argument("--budget-ms", type=float, help="fail if any handler imports slower than this")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.handlers if name not in HANDLERS]
+    if unknown:
+        parser.error(f"unknown handler(s): {', '.join(unknown)}")
+
+    report = profile(args.handlers or list(HANDLERS), args.runs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, result in report.items():
+            if "error" in result:
+                print(f"{name:<16} import failed: {result['error']}")
+                continue
+            heaviest = ", ".join(f"{module} {ms}ms" for module, ms in result["heaviest_imports_ms"].items())
+            print(f"{name:<16} {result['import_ms']:>8.1f} ms   {heaviest}")
+
+    failed = [name for name, result in report.items() if "error" in result]
+    over_budget = []
+    if args.budget_ms is not None:
+        over_budget = [name for name, result in report.items()
+                       if "error" not in result and result["import_ms"] > args.budget_ms]
+        for name in over_budget:
+            print(f"OVER BUDGET {name}: {report[name]['import_ms']} ms > {args.budget_ms} ms")
+    return 1 if failed or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+import io
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+import types
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# In-memory stand-ins for the AWS services the handlers use (moto-style),
+# plus a tiny OpenSearch HTTP server. Only the calls our code makes are modelled.
+
+
+class FakeSQS:
+    """SQS stand-in: one FIFO-ish list per queue URL, with in-flight tracking."""
+
+    def __init__(self):
+        self.queues = {}
+        self.sent_at = {}
+        self.received_at = {}
+        self.on_send = None
+        self._cond = threading.Condition()
+
+    def _queue(self, url):
+        return self.queues.setdefault(url, {"visible": [], "in_flight": {}})
+
+    def send_message(self, QueueUrl, MessageBody, MessageAttributes=None, DelaySeconds=0, **kwargs):
+        message_id = str(uuid.uuid4())
+        now = time.time()
+        message = {
+            "MessageId": message_id,
+            "Body": MessageBody,
+            "MessageAttributes": MessageAttributes or {},
+            "Attributes": {"SentTimestamp": str(int(now * 1000))},
+            "visible_at": now + DelaySeconds
+        }
+        with self._cond:
+            self._queue(QueueUrl)["visible"].append(message)
+            self.sent_at[message_id] = now
+            self._cond.notify_all()
+        if self.on_send:
+            self.on_send(QueueUrl, message)
+        return {"MessageId": message_id}
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages=1, WaitTimeSeconds=0, **kwargs):
+        deadline = time.time() + WaitTimeSeconds
+        with self._cond:
+            while True:
+                queue = self._queue(QueueUrl)
+                now = time.time()
+                ready = [m for m in queue["visible"] if m["visible_at"] <= now][:MaxNumberOfMessages]
+                if ready or now >= deadline:
+                    break
+                self._cond.wait(min(deadline - now, 0.05))
+
+            messages = []
+            for message in ready:
+                queue["visible"].remove(message)
+                receipt_handle = str(uuid.uuid4())
+                queue["in_flight"][receipt_handle] = message
+                self.received_at.setdefault(message["MessageId"], now)
+                message["Attributes"]["ApproximateFirstReceiveTimestamp"] = str(int(now * 1000))
+                messages.append({
+                    "MessageId": message["MessageId"],
+                    "ReceiptHandle": receipt_handle,
+                    "Body": message["Body"],
+                    "Attributes": dict(message["Attributes"]),
+                    "MessageAttributes": dict(message["MessageAttributes"])
+                })
+        return {"Messages": messages} if messages else {}
+
+    def delete_message(self, QueueUrl, ReceiptHandle, **kwargs):
+        with self._cond:
+            self._queue(QueueUrl)["in_flight"].pop(ReceiptHandle, None)
+        return {}
+
+    def get_queue_attributes(self, QueueUrl, AttributeNames=None, **kwargs):
+        with self._cond:
+            queue = self._queue(QueueUrl)
+            return {"Attributes": {
+                "ApproximateNumberOfMessages": str(len(queue["visible"])),
+                "ApproximateNumberOfMessagesNotVisible": str(len(queue["in_flight"]))
+            }}
+
+    def depth(self):
+        """Visible and in-flight message counts per queue URL."""
+        with self._cond:
+            return {url: (len(q["visible"]), len(q["in_flight"])) for url, q in self.queues.items()}
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def put_item(self, Item):
+        self.table.put_item(Item=Item)
+
+
+class FakeTable:
+    """DynamoDB Table stand-in keyed by a single hash key."""
+
+    def __init__(self, name, key="BusinessID"):
+        self.name = name
+        self.key = key
+        self.items = {}
+        self._lock = threading.Lock()
+
+    def put_item(self, Item, **kwargs):
+        with self._lock:
+            self.items[Item[self.key]] = dict(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        with self._lock:
+            item = self.items.get(Key[self.key])
+        return {"Item": dict(item)} if item else {}
+
+    def scan(self, **kwargs):
+        with self._lock:
+            return {"Items": [dict(item) for item in self.items.values()]}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, Limit=None, IndexName=None, **kwargs):
+        """Supports `<hash> = :v AND <range> <op> :v` with the range key compared numerically."""
+        match = re.fullmatch(r"(\w+) = (:\w+)(?: AND (\w+) (>=|<=|<|>|=) (:\w+))?", KeyConditionExpression.strip())
+        if not match:
+            raise ValueError(f"Unsupported KeyConditionExpression: {KeyConditionExpression}")
+        hash_key, hash_value, range_key, op, range_value = match.groups()
+        compare = {">=": float.__ge__, "<=": float.__le__, "<": float.__lt__, ">": float.__gt__, "=": float.__eq__}
+
+        with self._lock:
+            items = [item for item in self.items.values()
+                     if item.get(hash_key) == ExpressionAttributeValues[hash_value]]
+        if range_key:
+            bound = float(ExpressionAttributeValues[range_value])
+            items = [item for item in items
+                     if range_key in item and compare[op](float(item[range_key]), bound)]
+            items.sort(key=lambda item: float(item[range_key]))
+        return {"Items": [dict(item) for item in items[:Limit]]}
+
+    def batch_writer(self):
+        return FakeBatchWriter(self)
+
+
+class FakeDynamoDB:
+    def __init__(self):
+        self.tables = {}
+
+    def Table(self, name):
+        return self.tables.setdefault(name, FakeTable(name))
+
+
+class FakeSES:
+    """SES stand-in that records every email instead of sending it."""
+
+    def __init__(self):
+        self.sent = []
+        self.on_send = None
+        self._lock = threading.Lock()
+
+    def send_email(self, Source, Destination, Message, **kwargs):
+        record = {
+            "MessageId": str(uuid.uuid4()),
+            "to": Destination["ToAddresses"][0],
+            "subject": Message["Subject"]["Data"],
+            "sent_at": time.time()
+        }
+        with self._lock:
+            self.sent.append(record)
+        if self.on_send:
+            self.on_send(record)
+        return {"MessageId": record["MessageId"]}
+
+
+class FakeS3:
+    """S3 stand-in holding object bodies in memory."""
+
+    class NoSuchKey(Exception):
+        pass
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body if isinstance(Body, bytes) else Body.encode("utf-8")
+        return {}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if (Bucket, Key) not in self.objects:
+            raise FakeS3.NoSuchKey(f"s3://{Bucket}/{Key} does not exist")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+SLOT_ORDER = ["Location", "Cuisine", "DiningTime", "NumberOfPeople", "Email"]
+
+
+class FakeLex:
+    """
+    Lex V2 runtime stand-in that drives the LF1 code hook the way Lex would.
+
+    The fake bot fills whichever slot LF1 last elicited with the user's text.
+    LF0 sends every conversation with the same sessionId, so sessions are keyed
+    by the calling thread; a conversation must run entirely on one thread.
+    """
+
+    def __init__(self):
+        self.code_hook = None
+        self.on_code_hook = None
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def reset_session(self):
+        with self._lock:
+            self._sessions.pop(threading.get_ident(), None)
+
+    def last_state(self):
+        """Slot the bot is waiting for on this thread, or None once the dialog closed."""
+        with self._lock:
+            session = self._sessions.get(threading.get_ident())
+        return session["slotToElicit"] if session else None
+
+    def recognize_text(self, botId, botAliasId, localeId, sessionId, text, **kwargs):
+        key = threading.get_ident()
+        with self._lock:
+            session = self._sessions.setdefault(key, {
+                "slots": {name: None for name in SLOT_ORDER},
+                "slotToElicit": None,
+                "sessionAttributes": {}
+            })
+
+        if session["slotToElicit"]:
+            session["slots"][session["slotToElicit"]] = {
+                "value": {"originalValue": text, "interpretedValue": text, "resolvedValues": [text]}
+            }
+
+        event = {
+            "invocationSource": "DialogCodeHook",
+            "inputTranscript": text,
+            "sessionId": sessionId,
+            "sessionState": {
+                "sessionAttributes": session["sessionAttributes"],
+                "intent": {"name": "DiningSuggestionsIntent", "slots": dict(session["slots"]), "state": "InProgress"}
+            }
+        }
+        start = time.perf_counter()
+        response = self.code_hook(event, None)
+        if self.on_code_hook:
+            self.on_code_hook(time.perf_counter() - start)
+
+        state = response.get("sessionState", {})
+        action = state.get("dialogAction", {})
+        session["sessionAttributes"] = state.get("sessionAttributes") or {}
+        if action.get("type") == "ElicitSlot":
+            session["slotToElicit"] = action.get("slotToElicit")
+        else:
+            self.reset_session()
+
+        return {
+            "messages": response.get("messages", []),
+            "sessionState": state
+        }
+
+
+class FakeCredentials:
+    """Static credentials shaped like botocore's (frozen and refreshable)."""
+
+    access_key = "AKIDLOADTEST"
+    secret_key = "loadtest-secret"
+    token = None
+    method = "loadtest"
+
+    def get_frozen_credentials(self):
+        return self
+
+
+class FakeAWS:
+    """One shared set of service stand-ins handed out by the fake boto3 module."""
+
+    def __init__(self):
+        self.sqs = FakeSQS()
+        self.dynamodb = FakeDynamoDB()
+        self.ses = FakeSES()
+        self.s3 = FakeS3()
+        self.lex = FakeLex()
+
+    def client(self, service_name, *args, **kwargs):
+        clients = {"sqs": self.sqs, "ses": self.ses, "s3": self.s3, "lexv2-runtime": self.lex}
+        if service_name not in clients:
+            raise ValueError(f"Fake boto3 has no client for `{service_name}`")
+        return clients[service_name]
+
+    def resource(self, service_name, *args, **kwargs):
+        if service_name != "dynamodb":
+            raise ValueError(f"Fake boto3 has no resource for `{service_name}`")
+        return self.dynamodb
+
+    def as_boto3_module(self):
+        """Build a module object that can stand in for `boto3` in sys.modules."""
+        fake = types.ModuleType("boto3")
+        fake.client = self.client
+        fake.resource = self.resource
+
+        aws = self
+
+        class Session:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def get_credentials(self):
+                return FakeCredentials()
+
+            def client(self, service_name, *args, **kwargs):
+                return aws.client(service_name)
+
+            def resource(self, service_name, *args, **kwargs):
+                return aws.resource(service_name)
+
+        fake.Session = Session
+        return fake
+
+    def install(self):
+        """Replace `boto3` for every module imported afterwards."""
+        sys.modules["boto3"] = self.as_boto3_module()
+
+
+CUISINES = ['italian', 'chinese', 'mexican', 'indian', 'american', 'japanese']
+CITIES = ['new york', 'seattle', 'san francisco', 'chicago', 'boston', 'miami']
+
+
+def seed_restaurants(table, per_cuisine=50, seed=0, centroids=None):
+    """Fill a fake table with synthetic restaurants for every cuisine, scattered around their city."""
+    rng = random.Random(seed)
+    for cuisine in CUISINES:
+        for i in range(per_cuisine):
+            business_id = f"{cuisine}-{i:05d}"
+            centroid = (centroids or {}).get(CITIES[i % len(CITIES)], {"lat": 0.0, "lon": 0.0})
+            table.put_item(Item={
+                "BusinessID": business_id,
+                "Name": f"{cuisine.title()} Place {i}",
+                "Address": f"{rng.randint(1, 999)} Test Ave, New York, NY",
+                "Cuisine": cuisine,
+                "City": CITIES[i % len(CITIES)],
+                "CityCuisine": f"{CITIES[i % len(CITIES)]}#{cuisine}",
+                "SampleKey": round(rng.random(), 6),
+                "Coordinates": {
+                    "latitude": round(centroid["lat"] + rng.uniform(-0.15, 0.15), 6),
+                    "longitude": round(centroid["lon"] + rng.uniform(-0.15, 0.15), 6)
+                },
+                "Rating": round(rng.uniform(2.5, 5.0), 1),
+                "NumberOfReviews": rng.randint(1, 3000)
+            })
+
+
+def _distance_km(a, b):
+    """Haversine distance between two {"lat", "lon"} points."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a["lat"], a["lon"], b["lat"], b["lon"]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(h))
+
+
+def _matches(source, clause):
+    """Evaluate the small subset of query DSL the worker sends."""
+    if not clause or "match_all" in clause:
+        return True
+    for kind in ("match", "term"):
+        if kind in clause:
+            field, value = next(iter(clause[kind].items()))
+            if isinstance(value, dict):
+                value = value.get("query", value.get("value"))
+            return str(source.get(field, "")).lower() == str(value).lower()
+    if "geo_distance" in clause:
+        geo = dict(clause["geo_distance"])
+        limit_km = float(str(geo.pop("distance")).rstrip("km"))
+        field, origin = next(iter(geo.items()))
+        return field in source and _distance_km(source[field], origin) <= limit_km
+    if "terms" in clause:
+        field, values = next(iter(clause["terms"].items()))
+        return str(source.get(field, "")).lower() in [str(v).lower() for v in values]
+    if "bool" in clause:
+        bool_query = clause["bool"]
+        required = []
+        for key in ("must", "filter"):
+            clauses = bool_query.get(key, [])
+            required.extend([clauses] if isinstance(clauses, dict) else clauses)
+        return all(_matches(source, c) for c in required)
+    return True
+
+
+class FakeOpenSearch:
+    """Threaded local HTTP server answering `_search` from an in-memory document list."""
+
+    def __init__(self, documents, latency_ms=0.0, error_rate=0.0):
+        self.documents = documents
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.request_ms = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client gave up waiting (e.g. the worker's latency threshold)
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                start = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                query = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.split("?")[0].endswith("/_search"):
+                    self._reply(404, {"error": f"unsupported path {self.path}"})
+                    return
+                if fake.latency_ms:
+                    time.sleep(fake.latency_ms / 1000)
+                if fake.error_rate and random.random() < fake.error_rate:
+                    self._reply(503, {"error": "injected failure"})
+                    return
+
+                matched = [d for d in fake.documents if _matches(d, query.get("query"))]
+                hits = [{"_id": d.get("RestaurantID"), "_source": d} for d in matched[:query.get("size", 10)]]
+                took = (time.perf_counter() - start) * 1000
+                with fake._lock:
+                    fake.request_ms.append(took)
+                self._reply(200, {
+                    "took": int(took),
+                    "hits": {"total": {"value": len(matched), "relation": "eq"}, "hits": hits}
+                })
+
+            do_POST = do_GET
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,188 @@
+"""
+Microbenchmarks for the per-turn Lex dialog path in LF1.
+
+Measures CPU time and peak allocation per call for the helpers in
+lambdafunctions/LF1/utils.py and for handle_dining_suggestions, using the
+Lex V2 events in lexFixtures.json. Results can be saved as a baseline and
+later runs compared against it; regressions make the script exit non-zero.
+
+    python otherscripts/perf/lexBench.py --save-baseline
+    python otherscripts/perf/lexBench.py --compare
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from fakeServices import FakeAWS
+from loadTest import LAMBDA_DIR, load_handler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_PATH = os.path.join(HERE, "lexFixtures.json")
+DEFAULT_BASELINE_PATH = os.path.join(HERE, "lexBench.baseline.json")
+
+
+def load_lf1():
+    """Import LF1 with boto3 replaced, so SQS sends stay in memory."""
+    FakeAWS().install()
+    sys.path.insert(0, os.path.join(LAMBDA_DIR, "LF1"))
+    lf1 = load_handler("bench_lf1", os.path.join(LAMBDA_DIR, "LF1", "lambda_function.py"))
+    lf1.SQS_QUEUE_URLS = {tier: f"https://sqs.bench.local/000000000000/dining-requests-{tier}"
+                          for tier in lf1.SQS_QUEUE_URLS}
+    return lf1, sys.modules["utils"]
+
+
+def build_benchmarks(lf1, utils, fixtures):
+    """Name -> zero-argument callable for every benchmarked operation."""
+    full_slots = fixtures["all_slots_filled"]["sessionState"]["intent"]["slots"]
+
+    def validation_args(slots):
+        return (slots.get("Location"), slots.get("Cuisine"), slots.get("DiningTime"),
+                slots.get("NumberOfPeople"), slots.get("Email"))
+
+    benchmarks = {
+        "get_slot_value/dict": lambda: utils.get_slot_value(full_slots["Cuisine"]),
+        "get_slot_value/none": lambda: utils.get_slot_value(None),
+        "elicit_slot": lambda: utils.elicit_slot({}, "DiningSuggestionsIntent", full_slots, "Cuisine",
+                                                 "Please provide Cuisine."),
+        "close": lambda: utils.close({}, "Fulfilled", "Enjoy your meal."),
+        "is_valid_dining_time/24h": lambda: utils.is_valid_dining_time("19:00"),
+        "is_valid_dining_time/12h": lambda: utils.is_valid_dining_time("7:30 PM"),
+        "is_valid_dining_time/invalid": lambda: utils.is_valid_dining_time("whenever"),
+    }
+
+    for name in ("all_slots_filled", "invalid_location", "invalid_dining_time", "invalid_number_of_people"):
+        args = validation_args(fixtures[name]["sessionState"]["intent"]["slots"])
+        benchmarks[f"validate_dining_suggestions/{name}"] = lambda args=args: utils.validate_dining_suggestions(*args)
+
+    for name, event in fixtures.items():
+        benchmarks[f"handle_dining_suggestions/{name}"] = lambda event=event: lf1.handle_dining_suggestions(event)
+
+    return benchmarks
+
+
+def time_per_call(fn, min_time, repeats):
+    """Best-of-`repeats` CPU nanoseconds per call, each repeat running for at least `min_time` seconds."""
+    iterations = 1
+    while True:
+        start = time.process_time_ns()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.process_time_ns() - start
+        if elapsed >= min_time * 1e9:
+            break
+        iterations *= 2
+
+    samples = [elapsed / iterations]
+    for _ in range(repeats - 1):
+        start = time.process_time_ns()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.process_time_ns() - start) / iterations)
+    return min(samples)
+
+
+def peak_allocation(fn, calls=25):
+    """Median peak bytes allocated while a single call runs."""
+    fn()  # warm caches (regex compiles, lazy imports) outside the measurement
+    tracemalloc.start()
+    peaks = []
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    return int(statistics.median(peaks))
+
+
+def run(benchmarks, min_time, repeats, only=None):
+    results = {}
+    for name, fn in benchmarks.items():
+        if only and only not in name:
+            continue
+        results[name] = {
+            "cpu_ns": round(time_per_call(fn, min_time, repeats), 1),
+            "peak_bytes": peak_allocation(fn)
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return (name, metric, baseline, current) for everything slower or bigger than `threshold` x baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["cpu_ns"] > previous["cpu_ns"] * threshold:
+            regressions.append((name, "cpu_ns", previous["cpu_ns"], current["cpu_ns"]))
+        # Small absolute slack so a few extra bytes on tiny helpers do not flap
+        if current["peak_bytes"] > previous["peak_bytes"] * threshold + 256:
+            regressions.append((name, "peak_bytes", previous["peak_bytes"], current["peak_bytes"]))
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"{'benchmark':<58} {'cpu us/call':>12} {'vs base':>8} {'peak KiB':>9}")
+    for name, result in results.items():
+        previous = baseline.get(name)
+        ratio = f"{result['cpu_ns'] / previous['cpu_ns']:.2f}x" if previous else "-"
+        print(f"{name:<58} {result['cpu_ns'] / 1000:>12.2f} {ratio:>8} {result['peak_bytes'] / 1024:>9.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the LF1 Lex dialog hot path.")
+    parser.add_argument("--min-time", type=float, default=0.2, help="CPU seconds per timing repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="fail if results regress against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.3, help="allowed slowdown factor before flagging")
+    parser.add_argument("--json", action="store_true", help="print raw JSON results instead of a table")
+    args = parser.parse_args(argv)
+
+    with open(FIXTURES_PATH) as f:
+        fixtures = json.load(f)
+    lf1, utils = load_lf1()
+
+    results = run(build_benchmarks(lf1, utils, fixtures), args.min_time, args.repeats, args.filter)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        if saved.get("python") != sys.version.split()[0]:
+            print(f"Note: baseline was recorded on Python {saved.get('python')}, running {sys.version.split()[0]}")
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        if not baseline:
+            print(f"No baseline at {args.baseline}, run with --save-baseline first.")
+            return 2
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, previous, current in regressions:
+            print(f"REGRESSION {name}: {metric} {previous} -> {current}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Offline end-to-end load test: LF0 -> Lex -> LF1 -> SQS -> SQStoSES -> SES.
+
+Runs the real lambda_handler functions in process against the stand-ins in
+fakeServices.py, so worker and indexing changes can be compared without AWS.
+
+    python otherscripts/perf/loadTest.py --rate 20 --duration 30 --workers 4
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fakeServices import CITIES, CUISINES, FakeAWS, FakeOpenSearch, seed_restaurants
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+LAMBDA_DIR = os.path.join(REPO_ROOT, "lambdafunctions")
+LOADTEST_QUEUE_URL = "https://sqs.loadtest.local/000000000000/dining-requests"
+
+INVALID_ANSWERS = {
+    "Location": "atlantis",
+    "Cuisine": "martian",
+    "DiningTime": "whenever",
+    "NumberOfPeople": "50"
+}
+
+
+def load_handler(name, path):
+    """Import a lambda_function.py under a unique module name."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentiles(samples):
+    """p50/p95/p99/max in milliseconds (nearest rank) for a list of seconds."""
+    ordered = sorted(s * 1000 for s in samples)
+    if not ordered:
+        return {"count": 0}
+
+    def rank(pct):
+        return round(ordered[max(0, -(-pct * len(ordered) // 100) - 1)], 2)
+
+    return {"count": len(ordered), "p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1], 2)}
+
+
+class Recorder:
+    """Thread-safe latency samples per stage plus end-to-end correlation by email."""
+
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.started_at = {}
+        self.enqueued_at = {}
+        self.tiers = {}
+        self._lock = threading.Lock()
+
+    def sample(self, stage, seconds):
+        with self._lock:
+            self.stages.setdefault(stage, []).append(seconds)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+
+class ConversationUser:
+    """Synthetic user who answers whatever slot the bot elicits."""
+
+    def __init__(self, user_id, rng, invalid_rate):
+        self.slots = {
+            "Location": rng.choice(CITIES),
+            "Cuisine": rng.choice(CUISINES),
+            "DiningTime": f"{rng.randint(11, 22)}:{rng.choice(['00', '15', '30', '45'])}",
+            "NumberOfPeople": str(rng.randint(1, 8)),
+            "Email": f"user-{user_id}@loadtest.local"
+        }
+        # Each user gets at most one wrong answer per slot so conversations terminate
+        self.pending_invalid = {slot for slot in INVALID_ANSWERS if rng.random() < invalid_rate}
+
+    def answer(self, slot):
+        if slot in self.pending_invalid:
+            self.pending_invalid.discard(slot)
+            return INVALID_ANSWERS[slot]
+        return self.slots[slot]
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)  # Arrival schedule only; each user draws from its own generator
+        self.recorder = Recorder()
+        self.queue_depth = []
+        self.aws = FakeAWS()
+        self.aws.install()
+
+        sys.path.insert(0, os.path.join(LAMBDA_DIR, "shared"))
+        sys.path.insert(0, os.path.join(LAMBDA_DIR, "LF1"))
+        self.lf0 = load_handler("loadtest_lf0", os.path.join(LAMBDA_DIR, "LF0", "lambda_function.py"))
+        self.lf1 = load_handler("loadtest_lf1", os.path.join(LAMBDA_DIR, "LF1", "lambda_function.py"))
+        self.worker = load_handler("loadtest_worker", os.path.join(LAMBDA_DIR, "SQStoSES", "lambda_function.py"))
+        if not args.verbose:
+            logging.getLogger().setLevel(logging.WARNING)
+
+        # Point LF1 and the worker at the same tier queues, table and fake OpenSearch
+        queue_urls = {tier: f"{LOADTEST_QUEUE_URL}-{tier}" for tier in self.worker.SQS_QUEUE_URLS}
+        self.lf1.SQS_QUEUE_URLS = queue_urls
+        self.worker.SQS_QUEUE_URLS = queue_urls
+        from opensearch_client import CITY_CENTROIDS
+        table = self.aws.dynamodb.Table(self.worker.DYNAMODB_TABLE)
+        seed_restaurants(table, per_cuisine=args.restaurants_per_cuisine, seed=args.seed, centroids=CITY_CENTROIDS)
+
+        # Index documents exactly the way OSData builds them from DynamoDB items
+        indexer = load_handler("loadtest_osdata", os.path.join(REPO_ROOT, "otherscripts", "openSearch", "OSData.py"))
+        documents = [d for d in map(indexer.build_document, table.scan()["Items"]) if d]
+        self.opensearch = FakeOpenSearch(documents, latency_ms=args.opensearch_latency_ms,
+                                         error_rate=args.opensearch_error_rate)
+        if args.snapshot:
+            self.publish_snapshot(table)
+
+        self.aws.lex.code_hook = self.lf1.lambda_handler
+        self.aws.lex.on_code_hook = lambda seconds: self.recorder.sample("lf1_code_hook", seconds)
+        self.aws.sqs.on_send = self._on_enqueue
+        self.aws.ses.on_send = self._on_email
+        self._trace_worker()
+
+    def publish_snapshot(self, table):
+        """Build the ranked recommendation snapshot from the seeded table and put it where the worker reads it."""
+        builder = load_handler("loadtest_snapshot_builder", os.path.join(REPO_ROOT, "otherscripts", "buildRecommendations.py"))
+        payload = builder.serialize_snapshot(builder.build_snapshot(table.scan()["Items"]))
+        self.aws.s3.put_object(Bucket=self.worker.SNAPSHOT_BUCKET, Key=self.worker.SNAPSHOT_KEY, Body=payload)
+
+    def _trace_worker(self):
+        """Record the worker's own trace events (LF1 enqueue -> SES delivery) alongside the harness timings."""
+        emit = self.worker.RequestTrace.emit
+        recorder = self.recorder
+
+        def recording_emit(trace, event, **fields):
+            if event == "span":
+                recorder.sample(f"trace_span_{fields['span']}", fields["duration_ms"] / 1000)
+            elif event == "finished":
+                recorder.count(f"trace_outcome_{fields['outcome']}")
+                for name in ("RequestToEmailLatency", "QueueDwellTime", "WorkerTime"):
+                    if fields.get(f"{name}_ms") is not None:
+                        recorder.sample(f"trace_{name}", fields[f"{name}_ms"] / 1000)
+            emit(trace, event, **fields)
+
+        self.worker.RequestTrace.emit = recording_emit
+
+    def _on_enqueue(self, queue_url, message):
+        email = json.loads(message["Body"]).get("email")
+        tier = message["MessageAttributes"].get("UrgencyTier", {}).get("StringValue")
+        with self.recorder._lock:
+            self.recorder.enqueued_at[email] = time.time()
+            self.recorder.tiers[email] = tier
+        self.recorder.count(f"messages_enqueued_{tier}")
+        self.recorder.count("messages_enqueued")
+
+    def _on_email(self, record):
+        with self.recorder._lock:
+            started = self.recorder.started_at.get(record["to"])
+            enqueued = self.recorder.enqueued_at.get(record["to"])
+            tier = self.recorder.tiers.get(record["to"])
+        if enqueued:
+            self.recorder.sample("enqueue_to_email", record["sent_at"] - enqueued)
+            self.recorder.sample(f"enqueue_to_email_{tier}", record["sent_at"] - enqueued)
+        if started:
+            self.recorder.sample("request_to_email", record["sent_at"] - started)
+        self.recorder.count("emails_sent")
+
+    def run_conversation(self, user_id):
+        """Play one full conversation through LF0 on the calling thread."""
+        # A generator per user: pool threads sharing self.rng would make answers depend on scheduling
+        user = ConversationUser(user_id, random.Random(f"{self.args.seed}-{user_id}"), self.args.invalid_rate)
+        self.aws.lex.reset_session()
+        started = time.time()
+        with self.recorder._lock:
+            self.recorder.started_at[user.slots["Email"]] = started
+
+        text = "I need restaurant suggestions"
+        for _ in range(self.args.max_turns):
+            turn_start = time.perf_counter()
+            response = self.lf0.lambda_handler({"body": json.dumps({"message": text})}, None)
+            self.recorder.sample("lf0_turn", time.perf_counter() - turn_start)
+            if response["statusCode"] != 200:
+                self.recorder.count("conversations_failed")
+                return
+
+            state = self.aws.lex.last_state()
+            if state is None:
+                self.recorder.sample("conversation", time.time() - started)
+                self.recorder.count("conversations_completed")
+                return
+            text = user.answer(state)
+
+        self.recorder.count("conversations_abandoned")
+
+    def run_worker(self, stop):
+        """Invoke the SQStoSES handler back to back until told to stop."""
+        while not stop.is_set():
+            start = time.perf_counter()
+            result = self.worker.lambda_handler({}, None)
+            elapsed = time.perf_counter() - start
+            self.recorder.count(f"worker_status_{result['statusCode']}")
+            if result["body"] != json.dumps("No messages to process"):
+                self.recorder.sample("worker_invocation", elapsed)
+
+    def sample_queue(self, stop, started):
+        while not stop.is_set():
+            visible = in_flight = 0
+            for queue_visible, queue_in_flight in self.aws.sqs.depth().values():
+                visible += queue_visible
+                in_flight += queue_in_flight
+            self.queue_depth.append({"t": round(time.time() - started, 2), "visible": visible, "in_flight": in_flight})
+            stop.wait(self.args.sample_interval)
+
+    def queue_is_empty(self):
+        return all(v == 0 and f == 0 for v, f in self.aws.sqs.depth().values())
+
+    def run(self):
+        args = self.args
+        self.worker.OPENSEARCH_HOST = self.opensearch.start()
+
+        stop_workers = threading.Event()
+        stop_sampler = threading.Event()
+        started = time.time()
+        sampler = threading.Thread(target=self.sample_queue, args=(stop_sampler, started), daemon=True)
+        workers = [threading.Thread(target=self.run_worker, args=(stop_workers,), daemon=True)
+                   for _ in range(args.workers)]
+        sampler.start()
+        for worker in workers:
+            worker.start()
+
+        # Open-loop arrivals: users show up on schedule regardless of how busy we are
+        with ThreadPoolExecutor(max_workers=args.max_concurrent_users) as pool:
+            user_id = 0
+            next_arrival = time.time()
+            while time.time() - started < args.duration:
+                pool.submit(self.run_conversation, user_id)
+                self.recorder.count("conversations_started")
+                user_id += 1
+                gap = self.rng.expovariate(args.rate) if args.arrivals == "poisson" else 1.0 / args.rate
+                next_arrival += gap
+                time.sleep(max(0.0, next_arrival - time.time()))
+        arrivals_done = time.time()
+
+        drain_deadline = time.time() + args.drain_timeout
+        while not self.queue_is_empty() and time.time() < drain_deadline:
+            time.sleep(0.05)
+        finished = time.time()
+        stop_workers.set()
+        stop_sampler.set()
+        for worker in workers:
+            worker.join()
+        sampler.join()
+        self.opensearch.stop()
+
+        self.recorder.stages["opensearch_server"] = [ms / 1000 for ms in self.opensearch.request_ms]
+        self.recorder.stages["queue_wait"] = [
+            self.aws.sqs.received_at[message_id] - sent_at
+            for message_id, sent_at in self.aws.sqs.sent_at.items()
+            if message_id in self.aws.sqs.received_at
+        ]
+        return self.report(started, arrivals_done, finished)
+
+    def report(self, started, arrivals_done, finished):
+        counters = self.recorder.counters
+        elapsed = finished - started
+        return {
+            "config": vars(self.args),
+            "elapsed_seconds": round(elapsed, 2),
+            "arrival_seconds": round(arrivals_done - started, 2),
+            "counters": counters,
+            "throughput": {
+                "conversations_per_second": round(counters.get("conversations_completed", 0) / elapsed, 2),
+                "emails_per_second": round(counters.get("emails_sent", 0) / elapsed, 2)
+            },
+            "latency_ms": {stage: percentiles(samples) for stage, samples in sorted(self.recorder.stages.items())},
+            "queue_depth": {
+                "max_visible": max((s["visible"] for s in self.queue_depth), default=0),
+                "drained": self.queue_is_empty(),
+                "samples": self.queue_depth
+            }
+        }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end load test for the dining concierge pipeline.")
+    parser.add_argument("--rate", type=float, default=10.0, help="new conversations per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to keep generating arrivals")
+    parser.add_argument("--arrivals", choices=["poisson", "constant"], default="poisson")
+    parser.add_argument("--workers", type=int, default=2, help="concurrent SQStoSES invocations")
+    parser.add_argument("--max-concurrent-users", type=int, default=64)
+    parser.add_argument("--invalid-rate", type=float, default=0.1, help="chance a user first gives an invalid slot value")
+    parser.add_argument("--max-turns", type=int, default=20)
+    parser.add_argument("--restaurants-per-cuisine", type=int, default=200)
+    parser.add_argument("--opensearch-latency-ms", type=float, default=0.0, help="artificial delay per search")
+    parser.add_argument("--opensearch-error-rate", type=float, default=0.0,
+                        help="fraction of searches answered with 503 (exercises the DynamoDB fallback)")
+    parser.add_argument("--snapshot", action="store_true", help="serve recommendations from a prebuilt snapshot")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="seconds between queue depth samples")
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="keep the handlers' own print/log output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # The handlers print every event; swallow that unless asked for it
+    handler_output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with handler_output:
+        report = LoadTest(args).run()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
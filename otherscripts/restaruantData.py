@@ -1,13 +1,17 @@
 import json
 import boto3
 import datetime
+import random
 import requests
 from decimal import Decimal
+from functools import lru_cache
 import time
 
 # AWS Resources
-dynamodb = boto3.resource('dynamodb', region_name='your-region')
-table = dynamodb.Table('your-dynamodb-table')
+@lru_cache(maxsize=None)
+def get_table():
+    """ Connect to the DynamoDB table on first use """
+    return boto3.resource('dynamodb', region_name='your-region').Table('your-dynamodb-table')
 
 # Yelp API Configuration
 YELP_API_KEY = "your-yelp-api-key"
@@ -54,15 +58,21 @@ def fetch_yelp_restaurants(location, cuisine, total_required=240):
     print(f"Final count for {cuisine}: {len(restaurants)} restaurants.")
     return restaurants
 
-def store_in_dynamodb(restaurants, cuisine):
+def store_in_dynamodb(restaurants, cuisine, location):
     """ Use batch_writer() to store restaurant data in bulk """
-    with table.batch_writer() as batch:
+    city = location.strip().lower()  # Same normalization the recommendation worker uses
+    with get_table().batch_writer() as batch:
         for restaurant in restaurants:
             item = {
                 "BusinessID": restaurant["id"],
                 "Name": restaurant["name"],
                 "Address": ", ".join(restaurant["location"]["display_address"]),
                 "Cuisine": cuisine,
+                "City": city,
+                # Keys of the CityCuisineIndex / CuisineIndex GSIs used by the worker's fallback path;
+                # SampleKey is a random sort key so the fallback can start reading at a random point
+                "CityCuisine": f"{city}#{cuisine}",
+                "SampleKey": Decimal(str(round(random.random(), 6))),
                 "Coordinates": {
                     "latitude": Decimal(str(restaurant["coordinates"]["latitude"])),
                     "longitude": Decimal(str(restaurant["coordinates"]["longitude"]))
@@ -82,7 +92,7 @@ def lambda_handler(event, context):
         print(f"Fetching {cuisine} restaurants in {location}...")
         restaurants = fetch_yelp_restaurants(location, cuisine)
         if restaurants:
-            store_in_dynamodb(restaurants, cuisine)
+            store_in_dynamodb(restaurants, cuisine, location)
 
     return {"statusCode": 200, "body": json.dumps("Inserted all restaurants")}
 
@@ -0,0 +1,57 @@
+"""Dining-time urgency routing in LF1 (lambdafunctions/LF1)."""
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lambdafunctions", "LF1"))
+import utils  # noqa: E402
+
+UTC = datetime.timezone.utc
+
+
+@pytest.mark.parametrize("dining_time, city, now, expected", [
+    ("19:30", "new york", datetime.datetime(2026, 10, 19, 23, 0, tzinfo=UTC), 30),     # 19:00 local
+    ("19:30", "seattle", datetime.datetime(2026, 10, 19, 23, 0, tzinfo=UTC), 210),     # 16:00 local
+    ("00:30", "new york", datetime.datetime(2026, 10, 20, 3, 45, tzinfo=UTC), 45),     # 23:45 local, wraps midnight
+    ("23:30", "new york", datetime.datetime(2026, 10, 20, 4, 15, tzinfo=UTC), 0),      # 00:15 local, 45 min ago
+    ("18:00", "new york", datetime.datetime(2026, 10, 19, 23, 0, tzinfo=UTC), 0),      # exactly the grace window
+    ("17:59", "new york", datetime.datetime(2026, 10, 19, 23, 0, tzinfo=UTC), 1379),   # past grace: tomorrow
+    ("09:00", "new york", datetime.datetime(2026, 10, 19, 23, 0, tzinfo=UTC), 840),    # morning: tomorrow
+])
+def test_minutes_until_dining(dining_time, city, now, expected):
+    assert utils.minutes_until_dining(dining_time, utils.city_timezone(city), now) == expected
+
+
+def test_standard_offset_ignores_daylight_saving():
+    now = datetime.datetime(2026, 1, 15, 23, 0, tzinfo=UTC)  # 18:00 EST
+    assert utils.minutes_until_dining("19:00", utils.city_standard_offset("boston"), now) == 60
+
+
+@pytest.mark.parametrize("dining_time, expected", [("7:30 PM", "19:30"), ("19:30", "19:30"), ("EV", None), (None, None)])
+def test_normalize_dining_time(dining_time, expected):
+    assert utils.normalize_dining_time(dining_time) == expected
+
+
+@pytest.fixture
+def lf1():
+    pytest.importorskip("boto3")
+    import lambda_function
+    return lambda_function
+
+
+@pytest.mark.parametrize("dining_time", ["EV", "whenever"])
+def test_route_request_sends_unparsed_times_to_later(lf1, dining_time):
+    assert lf1.route_request(dining_time, "new york") == (None, None, "later")
+
+
+def test_route_request_without_timezone_database_still_routes(lf1, monkeypatch):
+    def missing_timezone(location):
+        raise lf1.ZoneInfoNotFoundError("No time zone found")
+
+    monkeypatch.setattr(lf1, "city_timezone", missing_timezone)
+    normalized_time, minutes_until, tier = lf1.route_request("19:00", "boston")
+    assert normalized_time == "19:00"
+    assert minutes_until is not None
+    assert tier == lf1.urgency_tier(minutes_until)